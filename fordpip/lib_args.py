@@ -164,6 +164,7 @@ def args_parser():
     parser.add_argument('-g', '--geocodes', '--geonames', action='store')
     parser.add_argument('-i', '--input', action='store')
     parser.add_argument('-l', '--language', action='store')
+    parser.add_argument('--lang-cache', dest='lang_cache', action='store', default=None)
     parser.add_argument('-max', '--maximum', action='store')
     parser.add_argument('-min', '--minimum', action='store')
     parser.add_argument('-n', '--number', dest='max_number', action='store')
@@ -180,6 +181,9 @@ def args_parser():
     parser.add_argument('-z', '--time-zone', '--timezone', dest='time_zone', action='store', default=None)
     parser.add_argument('--insert', dest='insert_words', action='store', default=[])
     parser.add_argument('--quick-parse', dest='quick_parse', action='store_true')
+    parser.add_argument('--workers', dest='workers', action='store', type=int, default=1)
+    parser.add_argument('--output-format', dest='output_format', choices=['csv', 'parquet', 'arrow'], default='csv')
+    parser.add_argument('--weighted-networks', dest='weighted_networks', action='store_true')
     # categorize only arguments
     parser.add_argument('-cf', action='store') # file
     parser.add_argument('-c-ms', action='store') # min size
@@ -8,61 +8,213 @@ the following URL:
 
 http://download.geonames.org/export/dump/
 
-The greater the file size, the more time it will
-take to load and parse the geolocation data.
+The gazetteer is indexed once in a SQLite file next to it,
+keyed by country code and lowercased name, and places are
+looked up lazily from that index on the next runs. Places
+are also indexed in a grid of cells by their coordinates,
+for finding the nearest place to a point.
 '''
 
-from collections import defaultdict
+import sqlite3
 from csv import reader
+from functools import lru_cache
+from math import cos, radians
+from os import remove, replace
+from os.path import getmtime, isfile
 
-from .lib_input import get_file_delimiter
+from .lib_input import get_file_delimiter, read_chunks
+
+GEONAMES_CACHE_SIZE = 65536
+GEONAMES_CELL_CACHE_SIZE = 4096
+
+GEONAMES_INDEX_EXTENSION = '.index.sqlite'
+GEONAMES_INDEX_VERSION = 2
+
+# grid cells of 0.1 degree (about 11 km), searched
+# in rings around a point up to about 1 degree away
+GEONAMES_CELL_SIZE = 0.1
+GEONAMES_CELL_ROWS = 1800
+GEONAMES_CELL_COLS = 3600
+GEONAMES_MAX_RING = 10
+
+def get_cell(latitude, longitude):
+    '''
+    Return grid row and column of coordinates.
+    '''
+    row = min(int((latitude + 90) // GEONAMES_CELL_SIZE), GEONAMES_CELL_ROWS - 1)
+    col = int((longitude + 180) // GEONAMES_CELL_SIZE) % GEONAMES_CELL_COLS
+    return row, col
+
+def get_ring(row, col, k):
+    '''
+    Return cell ids at distance k from a grid cell.
+    '''
+    cells = []
+    for r in range(row - k, row + k + 1):
+        if 0 <= r < GEONAMES_CELL_ROWS:
+            step = 1 if abs(r - row) == k else 2 * k # whole line or edges
+            for c in range(col - k, col + k + 1, step or 1):
+                cells.append(r * GEONAMES_CELL_COLS + c % GEONAMES_CELL_COLS)
+    return cells
+
+class GeoNames(object):
+    '''
+    Look up places in a GeoNames index built by
+    build_geonames_index(), opening it on first use.
+    '''
+    def __init__(self, filename):
+        self.filename = filename
+        self.connection = None
+        self.lookup = lru_cache(maxsize=GEONAMES_CACHE_SIZE)(self.query)
+        self.places = lru_cache(maxsize=GEONAMES_CELL_CACHE_SIZE)(self.query_cell)
+
+    def __getstate__(self):
+        return {'filename': self.filename}
+
+    def __setstate__(self, state):
+        self.__init__(state['filename'])
+
+    def connect(self):
+        '''
+        Return connection to index, opening it if needed.
+        '''
+        if self.connection is None:
+            self.connection = sqlite3.connect('file:' + self.filename + '?mode=ro', uri=True)
+        return self.connection
+
+    def nearest(self, points):
+        '''
+        Return latitude, longitude and GeoNames ID of the
+        nearest place to each point of a list of coordinates,
+        or None if invalid or no place is close enough.
+        '''
+        return [self.nearest_place(latitude, longitude) for latitude, longitude in points]
+
+    def nearest_place(self, latitude, longitude):
+        '''
+        Return nearest place to coordinates, searching grid
+        cells in rings until no closer place may be found.
+        '''
+        try: latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError): return None
+
+        row, col = get_cell(latitude, longitude)
+        scale = cos(radians(latitude))
+        place, distance = None, None
+
+        for k in range(GEONAMES_MAX_RING + 1):
+            for cell in get_ring(row, col, k):
+                for candidate in self.places(cell):
+                    d = (candidate[0] - latitude) ** 2\
+                      + (((candidate[1] - longitude + 180) % 360 - 180) * scale) ** 2
+                    if distance is None or d < distance:
+                        place, distance = candidate, d
+            # places in further rings are at least k cells away
+            if place and distance <= (k * GEONAMES_CELL_SIZE * scale) ** 2:
+                return place
+
+        return None
+
+    def query(self, country_code, name):
+        '''
+        Return latitude, longitude and GeoNames ID of
+        place by country code and name, or None if missing.
+        '''
+        return self.connect().execute(
+            'SELECT latitude, longitude, geoname_id FROM geonames WHERE country_code = ? AND name = ?',
+            (country_code, name)).fetchone()
+
+    def query_cell(self, cell):
+        '''
+        Return latitude, longitude and GeoNames ID
+        of all places in a grid cell.
+        '''
+        return self.connect().execute(
+            'SELECT latitude, longitude, geoname_id FROM places WHERE cell = ?', (cell,)).fetchall()
+
+def build_geonames_index(filename, index_filename):
+    '''
+    Read a GeoNames gazetteer file line by line and
+    write its places to a SQLite index, keeping the last
+    place with the same country code and name, and all
+    places by grid cell of their coordinates.
+    '''
+    delimiter = get_file_delimiter(filename)
+    tmp_filename = index_filename + '.tmp'
+
+    if isfile(tmp_filename):
+        remove(tmp_filename)
+
+    connection = sqlite3.connect(tmp_filename)
+    connection.execute('PRAGMA journal_mode = OFF')
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.execute('PRAGMA user_version = %d' % GEONAMES_INDEX_VERSION)
+    connection.execute('CREATE TABLE geonames (country_code TEXT, name TEXT, '
+        'latitude TEXT, longitude TEXT, geoname_id TEXT, PRIMARY KEY (country_code, name)) WITHOUT ROWID')
+    connection.execute('CREATE TABLE places (cell INTEGER, latitude REAL, longitude REAL, '
+        'geoname_id TEXT, PRIMARY KEY (cell, geoname_id)) WITHOUT ROWID')
+
+    with open(filename, 'rt', encoding='utf8') as csvfile:
+        csvfile = reader(csvfile, delimiter=delimiter)
+        for lines in read_chunks(csvfile, chunksize=100000):
+            geonames = []
+            places = []
+            for line_num, line in lines:
+                if len(line) > 8:
+                    geonames.append((line[8], line[1].lower(), line[4], line[5], line[0]))
+                    try: latitude, longitude = float(line[4]), float(line[5])
+                    except ValueError: continue
+                    row, col = get_cell(latitude, longitude)
+                    places.append((row * GEONAMES_CELL_COLS + col, latitude, longitude, line[0]))
+            connection.executemany('INSERT OR REPLACE INTO geonames VALUES (?, ?, ?, ?, ?)', geonames)
+            connection.executemany('INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?)', places)
+
+    connection.commit()
+    country_codes = connection.execute('SELECT COUNT(DISTINCT country_code) FROM geonames').fetchone()[0]
+    connection.close()
+    replace(tmp_filename, index_filename)
+    print('Indexed', country_codes, 'gazetteer' + ('s' if country_codes>1 else '') + '.')
 
 def get_geoname(str_place, geonames, ccode):
     '''
-    Find key and value from a dictionary
+    Find place in a GeoNames index
     loaded by load_geonames() function.
     '''
-    latitude = geonames[ccode][str_place][0]
-    longitude = geonames[ccode][str_place][1]
-    geoname_id = geonames[ccode][str_place][2]
+    latitude, longitude, geoname_id = geonames.lookup(ccode, str_place)
     geoname = 'Approximate (ID ' + geoname_id + ')'
     return latitude, longitude, geoname
 
+def get_index_version(index_filename):
+    '''
+    Return version of a GeoNames index file.
+    '''
+    connection = sqlite3.connect('file:' + index_filename + '?mode=ro', uri=True)
+    version = connection.execute('PRAGMA user_version').fetchone()[0]
+    connection.close()
+    return version
+
 def load_geonames(filename):
     '''
-    Read a GeoNames gazzetteer file if present and returns a
-    list of the data in it, indexed in a dictionary with keys
-    as country codes. If no data is in the file, or the file
-    is not present, it returns an empty dictionary.
-    Download from: <http://download.geonames.org/export/dump/>
+    Open the index of a GeoNames gazzetteer file if present,
+    building it first if missing, outdated or older than the file.
+    If the file is not present or fails to be indexed, it
+    returns None. Download from: <http://download.geonames.org/export/dump/>
     '''
-    geonames = defaultdict(dict)
-    try: # load list
-        delimiter = get_file_delimiter(filename)
-        with open(filename, 'rt', encoding='utf8') as csvfile:
-            csvfile = reader(csvfile, delimiter=delimiter)
-            for line in csvfile:
-                geoname_id = line[0]
-                name = line[1].lower()
-                # ascii_name = line[2]
-                # aliases = line[3]
-                latitude = str(line[4])
-                longitude = str(line[5])
-                # feature_class = line[6]
-                # feature_code = line[7]
-                country_code = line[8]
-                # cc2 = line[9]
-                # admin1_code = line[10]
-                # admin2_code = line[11]
-                # admin3_code = line[12]
-                # admin4_code = line[13]
-                # population = line[14]
-                # elevation = line[15]
-                # dem = line[16]
-                # timezone = line[17]
-                # modification_date = line[18]
-                geonames[country_code][name] = (latitude, longitude, geoname_id)
-        country_codes = len(geonames) # count number of countries considered
-        print('Loaded', country_codes, 'gazetteer' + ('s' if country_codes>1 else '') + '.')
-    except: geonames = {}
-    return geonames
\ No newline at end of file
+    if isinstance(filename, GeoNames):
+        return filename # already loaded
+
+    if not filename or not isfile(filename):
+        return None
+
+    index_filename = filename + GEONAMES_INDEX_EXTENSION
+
+    try: # build once
+        if not isfile(index_filename)\
+        or getmtime(index_filename) < getmtime(filename)\
+        or get_index_version(index_filename) < GEONAMES_INDEX_VERSION:
+            build_geonames_index(filename, index_filename)
+    except Exception as e:
+        print('Warning: failed to index gazetteer (' + str(e) + ').')
+        return None
+
+    return GeoNames(index_filename)
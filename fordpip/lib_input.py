@@ -7,14 +7,238 @@ handling and parsing, largerly used by the
 "parse-facebook" and "parse-tweets" scripts.
 '''
 
+from array import array
 from csv import reader
 from collections import defaultdict, OrderedDict
+from heapq import nlargest
 from itertools import combinations
-from os.path import dirname, realpath, splitext
+from operator import itemgetter
+from os.path import dirname, getsize, realpath, splitext
 
 try: from requests import head
 except: print('Warning: failed to import python3-requests.')
 
+try: import numpy as np
+except: np = None
+
+# characters removed by str_to_list()
+STR_TO_LIST_TAB = str.maketrans('', '', '"\'\n\r')
+
+# characters removed from network values
+NETWORK_VALUE_TAB = str.maketrans('', '', ',\'"\n\r')
+
+class CounterStore(object):
+    '''
+    Count metrics for the same keys (e.g. words or users)
+    in integer array columns, storing each key only once.
+    Keys keep the order they were first counted in.
+    '''
+    def __init__(self, columns):
+        self.ids = {}
+        self.keys = []
+        self.columns = {column: array('q') for column in columns}
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, column, value=1):
+        '''
+        Add value to key in column.
+        '''
+        self.columns[column][self.get_id(key)] += value
+
+    def count(self, column):
+        '''
+        Return number of keys with values in column.
+        '''
+        return sum(1 for value in self.columns[column] if value)
+
+    def get(self, key, column):
+        '''
+        Return value of key in column, or zero if missing.
+        '''
+        i = self.ids.get(key)
+        return self.columns[column][i] if i is not None else 0
+
+    def get_id(self, key):
+        '''
+        Return ID of key, adding it if missing.
+        '''
+        i = self.ids.get(key)
+        if i is None:
+            i = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            for values in self.columns.values():
+                values.append(0)
+        return i
+
+    def merge(self, other):
+        '''
+        Sum values from another store.
+        '''
+        for key, j in other.ids.items():
+            i = self.get_id(key)
+            for column, values in self.columns.items():
+                values[i] += other.columns[column][j]
+        return self
+
+    def to_dict(self, column):
+        '''
+        Return column as a dictionary of keys and values.
+        '''
+        return dict(zip(self.keys, self.columns[column]))
+
+    def top(self, column, N=False):
+        '''
+        Return keys with top N values in column,
+        keeping ties in order as get_N_first().
+        '''
+        values = self.columns[column]
+        if N == 0 or not values: return []
+        if np is not None: # vectorized
+            ids = np.argsort(-np.frombuffer(values, dtype=np.int64), kind='stable')
+            ids = ids[:N] if N else ids
+        elif N: ids = nlargest(N, range(len(values)), key=values.__getitem__)
+        else: ids = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+        return [self.keys[i] for i in ids]
+
+class EdgeList(object):
+    '''
+    Store edges of a network in columns, one per position.
+    The first "interned" columns (source, target and type),
+    whose values repeat, are kept as integer IDs in arrays,
+    with values sanitized once in a pool that may be shared
+    by many networks; the others (eg. tweet IDs and times)
+    are sanitized for each edge and kept as they come.
+    Iterating yields edges as tuples of strings.
+    '''
+    def __init__(self, pool=None, interned=3):
+        self.pool = pool if pool is not None else ValuePool()
+        self.interned = interned
+        self.columns = []
+
+    def __iter__(self):
+        values = self.pool.values
+        n = self.interned
+        for line in zip(*self.columns):
+            yield tuple(values[i] for i in line[:n]) + line[n:]
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def append(self, line):
+        '''
+        Add edge from a list of values.
+        '''
+        n = self.interned
+        if not self.columns:
+            self.columns = [array('q') if i < n else [] for i in range(len(line))]
+        get_id = self.pool.get_id
+        for column, value in zip(self.columns[:n], line[:n]):
+            column.append(get_id(value))
+        for column, value in zip(self.columns[n:], line[n:]):
+            column.append(sanitize_value(value))
+
+    def extend(self, other, ids=None):
+        '''
+        Add edges from another list, given the
+        IDs of its pool values in this one's pool.
+        '''
+        if ids is None:
+            ids = self.pool.merge(other.pool)
+        n = self.interned
+        if not self.columns:
+            self.columns = [array('q') if i < n else [] for i in range(len(other.columns))]
+        for column, other_column in zip(self.columns[:n], other.columns[:n]):
+            column.extend(ids[i] for i in other_column)
+        for column, other_column in zip(self.columns[n:], other.columns[n:]):
+            column.extend(other_column)
+
+class WeightedEdgeList(EdgeList):
+    '''
+    Count edges of a network by source and target IDs,
+    ignoring other values. Iterating yields edges as
+    tuples of source, target and weight (count).
+    '''
+    def __init__(self, pool=None):
+        super().__init__(pool)
+        self.weights = {}
+
+    def __iter__(self):
+        values = self.pool.values
+        for (source, target), weight in self.weights.items():
+            yield (values[source], values[target], weight)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def append(self, line):
+        '''
+        Add edge from source and target values.
+        '''
+        key = (self.pool.get_id(line[0]), self.pool.get_id(line[1]))
+        self.weights[key] = self.weights.get(key, 0) + 1
+
+    def extend(self, other, ids=None):
+        '''
+        Add edge weights from another list, given the
+        IDs of its pool values in this one's pool.
+        '''
+        if ids is None:
+            ids = self.pool.merge(other.pool)
+        weights = self.weights
+        for (source, target), weight in other.weights.items():
+            key = (ids[source], ids[target])
+            weights[key] = weights.get(key, 0) + weight
+
+    def undirected(self):
+        '''
+        Return edges summing weights of both directions,
+        as first seen, for writing undirected networks.
+        '''
+        weights = {}
+        for (source, target), weight in self.weights.items():
+            key = (target, source) if (target, source) in weights else (source, target)
+            weights[key] = weights.get(key, 0) + weight
+        values = self.pool.values
+        return [(values[source], values[target], weight) for (source, target), weight in weights.items()]
+
+class ValuePool(object):
+    '''
+    Sanitize and store each distinct network value once,
+    mapping values as read to integer IDs.
+    '''
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def get_id(self, value):
+        '''
+        Return ID of value, sanitizing it only if missing.
+        Values equal once sanitized share the same ID, and
+        are also mapped as read if sanitizing changed them.
+        '''
+        i = self.ids.get(value)
+        if i is None:
+            key = sanitize_value(value)
+            i = self.ids.get(key)
+            if i is None:
+                i = self.ids[key] = len(self.values)
+                self.values.append(key)
+            if key != value:
+                self.ids[value] = i
+        return i
+
+    def merge(self, other):
+        '''
+        Add values from another pool and
+        return their IDs in this pool.
+        '''
+        return [self.get_id(value) for value in other.values]
+
 def add_to_dicts(key, dict_int, dict_dates={}, date=None, dict_set={}, item=None):
     '''
     Add key to dictionaries accordingly.
@@ -27,18 +251,9 @@ def add_to_network(network, line):
     '''
     Add source-target relation to list.
     '''
-    edge = []
-    for value in line:
-        value = str(value).replace(',','')\
-                          .replace('\'','')\
-                          .replace('"','')\
-                          .replace('\n','')\
-                          .replace('\r','')
-        value = value[:140] + ('...' if len(str(value)) > 140 else '')
-        value = value.encode(encoding='utf8', errors='ignore')\
-                     .decode(encoding='utf8', errors='ignore')
-        edge.append(value)
-    network.append(tuple(edge))
+    if isinstance(network, EdgeList):
+        network.append(line)
+    else: network.append(tuple(sanitize_value(value) for value in line))
 
 def dict_of_int_from_dict_of_lists(dict_of_lists):
     '''
@@ -106,28 +321,56 @@ def get_file_header(file_name, lowcase=True, lst=False, title=False):
 
     return fields
 
+def get_file_shards(file_name, shards=1, quotechar='"', block_size=16777216):
+    '''
+    Return byte ranges splitting a file in a number of shards,
+    skipping the header and breaking only at record boundaries,
+    i.e. line breaks with an even count of quotes before them.
+    '''
+    quote = quotechar.encode('utf8') if quotechar else b''
+
+    with open(file_name, 'rb') as input_file:
+        input_file.readline() # skips the header
+        offsets = [input_file.tell()]
+        step = (getsize(file_name) - offsets[0]) // max(shards, 1)
+        target = offsets[0] + step
+        position = offsets[0]
+        parity = 0
+
+        while len(offsets) < shards and step > 0:
+            block = input_file.read(block_size)
+            if not block: break
+            i = max(0, target - position)
+            last = 0
+            while i < len(block) and len(offsets) < shards:
+                j = block.find(b'\n', i)
+                if j < 0: break
+                parity ^= (block.count(quote, last, j) & 1) if quote else 0
+                last = j
+                if not parity: # record boundary
+                    offsets.append(position + j + 1)
+                    target += step
+                i = max(j + 1, target - position)
+            parity ^= (block.count(quote, last) & 1) if quote else 0
+            position += len(block)
+
+    offsets.append(getsize(file_name))
+    return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
 def get_N_first(dict_words, N=False, values=False):
     '''
-    Return the N topwords of a list.
+    Return the N topwords of a list. Only the top N
+    items are selected if given, keeping ties in order.
     '''
-    aux = []
-    top_words = []
-
-    if N == 0: return aux
-
-    for key, value in dict_words.items():
-        top_words.append([key, value])
+    if N == 0: return []
 
-    top_words.sort(key=lambda x:x[1], reverse=True)
+    if N: # partial selection
+        top_words = nlargest(N, dict_words.items(), key=itemgetter(1))
+    else: top_words = sorted(dict_words.items(), key=itemgetter(1), reverse=True)
 
     if values: # [key,value]
-        for item in top_words:
-            aux.append([item[0], item[1]])
-    else: # default; key only
-        for item in top_words:
-            aux.append(item[0])
-
-    return aux[:N] if N else aux
+        return [[key, value] for key, value in top_words]
+    return [key for key, value in top_words] # default; key only
 
 def list_combinations(list_of_values):
     '''
@@ -181,6 +424,20 @@ def load_list(filename, filter_strings=[]):
     except: filter_strings = []
     return filter_strings
 
+def merge_dicts(dict_a, dict_b):
+    '''
+    Merge values from a dictionary into another, summing
+    numbers and joining sets or lists for common keys.
+    '''
+    for key, value in dict_b.items():
+        if key not in dict_a:
+            dict_a[key] = value
+        elif isinstance(value, set):
+            dict_a[key] |= value
+        else: # int, float or list
+            dict_a[key] += value
+    return dict_a
+
 def normalize_dict(dict_str_int_wordcount):
     '''
     Normalize the dictionary with the word count.
@@ -191,14 +448,48 @@ def normalize_dict(dict_str_int_wordcount):
     max_elem = max(dict_str_int_wordcount.values())
 
     for key, value in dict_str_int_wordcount.items():
-        normalized_val = float((100 * value)/max_elem) # int((100 * value)
+        dict_str_int_wordcount[key] = normalize_value(value, max_elem)
 
-        if normalized_val < 1: # == 0
-            normalized_val = 1
+    return dict_str_int_wordcount
 
-        dict_str_int_wordcount[key]= normalized_val
+def normalize_value(value, max_value):
+    '''
+    Return value proportional to the maximum value
+    as 100, with a minimum of 1 (see normalize_dict).
+    '''
+    normalized_val = float((100 * value)/max_value) # int((100 * value)
 
-    return dict_str_int_wordcount
+    if normalized_val < 1: # == 0
+        normalized_val = 1
+
+    return normalized_val
+
+def read_file_shard(file_name, start, end, encoding='utf8'):
+    '''
+    Yield decoded lines from a byte range of a file,
+    as returned by the get_file_shards() function.
+    '''
+    with open(file_name, 'rb') as input_file:
+        input_file.seek(start)
+        position = start
+        while position < end:
+            line = input_file.readline()
+            if not line: break
+            position += len(line)
+            yield line.decode(encoding).replace('\r\n', '\n')
+
+def read_chunks(file_reader, chunksize=1000):
+    '''
+    Yield lists of line numbers and lines read from a CSV reader.
+    '''
+    chunk = []
+    for line in file_reader:
+        chunk.append((file_reader.line_num, line))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 def read_line(line, columns):
     '''
@@ -209,6 +500,16 @@ def read_line(line, columns):
         data[column] = line[columns[column]]
     return data
 
+def sanitize_value(value):
+    '''
+    Return value as string for network files, without
+    commas, quotes and line breaks, truncated if too long.
+    '''
+    value = str(value).translate(NETWORK_VALUE_TAB)
+    value = value[:140] + ('...' if len(value) > 140 else '')
+    return value.encode(encoding='utf8', errors='ignore')\
+                .decode(encoding='utf8', errors='ignore')
+
 def split_list(iterable, chunksize=100):
     '''
     Split an array in iterables of N items.
@@ -220,13 +521,18 @@ def str_from_list(lst, separator=', '):
     '''
     Return list as string.
     '''
-    s = ''
+    if isinstance(lst, set):
+        lst = sorted(lst)
     if isinstance(lst, list):
-        for i in range(len(lst)):
-            s = s + str(lst[i]) + (separator if i + 1 != len(lst) else '')
-        return s
+        return separator.join(map(str, lst))
     else: return str(lst)
 
+def str_from_lists(column, separator=', '):
+    '''
+    Return column of lists as strings.
+    '''
+    return [str_from_list(lst, separator) for lst in column]
+
 def str_from_num(number, decimal=2):
     '''
     Return the given int or float number with
@@ -255,13 +561,15 @@ def str_to_list(string, separator=','):
     '''
     Return string as list.
     '''
-    s = str(string).replace(separator+' ', separator)\
-                   .replace('"', '')\
-                   .replace('\'', '')\
-                   .replace('\n', '')\
-                   .replace('\r', '')
+    s = str(string).replace(separator+' ', separator).translate(STR_TO_LIST_TAB)
     return s.split(separator) if s else []
 
+def str_to_lists(column, separator=','):
+    '''
+    Return column of strings as lists.
+    '''
+    return [str_to_list(string, separator) for string in column]
+
 def time_to_print(current, mark=100000, msg='Read %n lines.\n', n='%n'):
     '''
     Return current line count and print total
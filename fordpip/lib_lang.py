@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+This module contains functions for detecting the language
+of texts with fastText, through the ftlangdetect module.
+
+Languages are cached by a hash of the text, so duplicate
+texts and retweets are detected once, and may be saved to
+a CSV file to be loaded again on the next run.
+'''
+
+from csv import reader, writer
+from hashlib import blake2b
+from os.path import isfile
+
+try:
+    from ftlangdetect import detect
+    from ftlangdetect.detect import get_or_load_model
+except:
+    print('Warning: failed to import ftlangdetect. All content will be considered in pt.')
+    def detect(text): return {'lang':'pt'}
+    get_or_load_model = None
+
+LANG_DEFAULT = 'pt'
+
+def detect_lang(text, dict_lang, default=LANG_DEFAULT):
+    '''
+    Return language detected from text,
+    using cache if already detected.
+    '''
+    key = get_text_hash(text)
+    if key not in dict_lang:
+        try: dict_lang[key] = detect(text.replace('\n', ' ').replace('\r', ' '))['lang']
+        except: dict_lang[key] = default
+    return dict_lang[key]
+
+def detect_langs(texts, dict_lang, default=LANG_DEFAULT):
+    '''
+    Return languages detected from a list of texts,
+    predicting texts not in cache in a single batch.
+    '''
+    keys = [get_text_hash(text) for text in texts]
+    missing = {}
+
+    for key, text in zip(keys, texts):
+        if key not in dict_lang:
+            missing[key] = text.replace('\n', ' ').replace('\r', ' ')
+
+    if missing and get_or_load_model:
+        try: # predict all at once
+            labels, scores = get_or_load_model().predict(list(missing.values()))
+            for key, label in zip(missing.keys(), labels):
+                dict_lang[key] = label[0].replace('__label__', '')
+        except: pass
+
+    for key, text in missing.items():
+        if key not in dict_lang:
+            detect_lang(text, dict_lang, default)
+
+    return [dict_lang[key] for key in keys]
+
+def get_text_hash(text):
+    '''
+    Return short hash for text used as cache key.
+    '''
+    return blake2b(text.encode('utf8', 'ignore'), digest_size=8).hexdigest()
+
+def load_lang_cache(filename):
+    '''
+    Read languages cached by write_lang_cache() if file
+    is present, or return an empty dictionary otherwise.
+    '''
+    dict_lang = {}
+    if filename and isfile(filename):
+        with open(filename, 'rt', encoding='utf8') as f:
+            file_reader = reader(f)
+            next(file_reader, None) # skip header
+            for line in file_reader:
+                if len(line) == 2:
+                    dict_lang[line[0]] = line[1]
+    return dict_lang
+
+def write_lang_cache(filename, dict_lang):
+    '''
+    Write cached languages to file.
+    '''
+    with open(filename, 'w', newline='', encoding='utf8') as f:
+        file_writer = writer(f)
+        file_writer.writerow(['text_hash', 'lang'])
+        for key, lang in dict_lang.items():
+            file_writer.writerow([key, lang])
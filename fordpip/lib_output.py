@@ -11,20 +11,82 @@ The constants used in it are:
 
     * MAX_WORDS_NUMBER_WORDCLOUD: maximum number of words to be in the TXT
     file that will be used to generate the wordcloud;
+
+    * OUTPUT_BUFFER_SIZE: size in bytes of the buffer of output files;
+
+    * OUTPUT_FORMATS: output formats and their file extensions. Tables
+    can also be written as Parquet or Arrow IPC (Feather) files with
+    typed columns, which requires pandas and pyarrow.
+
+Rows may be given as any iterable, including generators, and are
+written as they come. Files appended to with write_to_csv() or
+write_lines_to_csv() are closed after each call, unless a CSVWriters
+context is given to keep one buffered file and writer open per file.
 '''
 
 from csv import writer, QUOTE_MINIMAL
+from heapq import nlargest, nsmallest
+from importlib.util import find_spec
+from os.path import splitext
 
-from .lib_input import normalize_dict, str_pct
+from .lib_input import WeightedEdgeList, normalize_value, str_from_num, str_pct
 from .lib_text import *
 from .lib_time import *
 
 try: from requests import post
 except: print('Warning: failed to import python3-requests.')
 
+try: import pandas as pd
+except: pd = None
+
 MAX_WORDS_NUMBER_CSV = 1000
 MAX_WORDS_NUMBER_WORDCLOUD = 120
 
+OUTPUT_BUFFER_SIZE = 1048576
+
+OUTPUT_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+class CSVWriters(object):
+    '''
+    Keep one buffered file and CSV writer open per output
+    file, appending lines to it until closed. Files are
+    closed on leaving it if used as a context manager:
+
+        with CSVWriters() as writers:
+            for line in lines:
+                write_to_csv(filename, line, ',', QUOTE_MINIMAL, writers)
+    '''
+    def __init__(self):
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''
+        Close all files, writing what is left in their buffers.
+        '''
+        for csvfile, file_writer in self.files.values():
+            csvfile.close()
+        self.files.clear()
+
+    def get(self, filename, delimiter=',', quoting=QUOTE_MINIMAL):
+        '''
+        Return writer of file, opening it in append mode if missing.
+        Another delimiter or quoting replaces the file's writer.
+        '''
+        csvfile, file_writer = self.files.get(filename, (None, None))
+        if csvfile is None:
+            csvfile = open_output(filename, mode='a')
+        if file_writer is None\
+        or (file_writer.dialect.delimiter, file_writer.dialect.quoting) != (delimiter, quoting):
+            file_writer = writer(csvfile, delimiter=delimiter, quoting=quoting)
+            self.files[filename] = (csvfile, file_writer)
+        return file_writer
+
 def expand_comments_per_post(dict_likes_count):
     '''
     Expand comments per post on Netvizz datasets.
@@ -37,6 +99,19 @@ def expand_comments_per_post(dict_likes_count):
 
     return list_top_comments
 
+def get_output_format(output_format):
+    '''
+    Return a valid output format, falling back
+    to CSV if required modules are not installed.
+    '''
+    output_format = (output_format or 'csv').lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError('output format must be one of: ' + ', '.join(OUTPUT_FORMATS))
+    if output_format != 'csv' and (pd is None or find_spec('pyarrow') is None):
+        print('Warning: failed to import pandas and pyarrow. Output will be written as CSV.')
+        return 'csv'
+    return output_format
+
 def int_dictionary_to_csv(filename, int_dict_in, column_titles, delimiter=','):
     '''
     Writes a CSV file in the following format:
@@ -102,6 +177,12 @@ def interactions_summary_to_csv(filename, list_summary, column_titles, delimiter
             line = [date] + item[1:]
             file_writer.writerow(line)
 
+def open_output(filename, mode='w', encoding='utf8'):
+    '''
+    Open output file for CSV writing with a large buffer.
+    '''
+    return open(filename, mode, newline='', encoding=encoding, buffering=OUTPUT_BUFFER_SIZE)
+
 def replace_comments_id_with_comment_text(list_comments_likes, dict_comment_id_text):
     '''
     Replace comments' ID with comments' text on Netvizz datasets.
@@ -145,35 +226,46 @@ def send_request(array, url, tts=30):
             sleep_seconds(tts)
         else: break
 
-def write_gdf(filename, edges, nodes=[], header_nodes=[], header_edges=[], directed=True, delimiter=','):
+def write_gdf(filename, edges, nodes=[], header_nodes=[], header_edges=[], directed=True, delimiter=',',
+              output_format='csv'):
     '''
-    Exports nodes and edges to Gephi compatible graph format.
+    Exports nodes and edges to Gephi compatible graph format,
+    or to separate nodes and edges tables if columnar.
+    Weighted edges are merged by pair if not directed.
     '''
+    if not directed and isinstance(edges, WeightedEdgeList):
+        edges = edges.undirected()
+
     header_nodes = ['nodedef>name VARCHAR'] + (header_nodes if header_nodes else [])
     header_edges = ['edgedef>node1 VARCHAR', 'node2 VARCHAR'] + (header_edges if header_edges else [])
     header_edges.append('directed BOOLEAN')
 
-    with open(filename, 'w', newline='', encoding='utf8') as graphfile:
+    if output_format != 'csv':
+        name = splitext(filename)[0]
+        get_name = lambda column: column.split('>')[-1].split()[0]
+        write_table(name + '_nodes', nodes, [get_name(column) for column in header_nodes], output_format)
+        write_table(name + '_edges', ((*line, directed) for line in edges),
+                    [get_name(column) for column in header_edges], output_format)
+        return
+
+    with open_output(filename) as graphfile:
         file_writer = writer(graphfile, delimiter=delimiter)
         file_writer.writerow(header_nodes)
-        for line in nodes:
-            row = list(line)
-            file_writer.writerow(row)
+        file_writer.writerows(nodes)
         file_writer.writerow(header_edges)
-        for line in edges:
-            row = list(line)
-            row.append(directed)
-            file_writer.writerow(row)
+        file_writer.writerows((*line, directed) for line in edges)
 
-def write_set(filename, set_input, header=[], delimiter=',', encoding='utf8'):
+def write_set(filename, set_input, header=[], delimiter=',', encoding='utf8', output_format='csv'):
     '''
-    Write a set to CSV.
+    Write a set, list or generator of rows to CSV.
     '''
-    with open(filename, 'w', newline='', encoding=encoding) as f:
+    if output_format != 'csv':
+        return write_table(filename, set_input, header, output_format)
+
+    with open_output(filename, encoding=encoding) as f:
         file_writer = writer(f, delimiter=delimiter, quoting=QUOTE_MINIMAL)
         file_writer.writerow(header)
-        for line in set_input:
-            file_writer.writerow(list(line))
+        file_writer.writerows(set_input)
 
 def write_top_comments(dict_likes_count, dict_comment_id_text, dict_post_id_text, delimiter=','):
     '''
@@ -198,29 +290,60 @@ def write_top_comments(dict_likes_count, dict_comment_id_text, dict_post_id_text
                 file_writer.writerow([item[0], item[1], item[2]])
 
 def write_values(filename, dict_in, header=[], reverse=True, pct=False, delimiter=',', encoding='utf8',
-                 sort_key_function=lambda t: int(t[1]), value_format_function=lambda t: t):
+                 sort_key_function=lambda t: int(t[1]), value_format_function=lambda t: t, output_format='csv'):
                  # sort_key_function=lambda t:t, # lambda t:(t[0:2], t[3:5], t[6:8])
     '''
     Given a dictionary, a sorting function for it's keys
     a value format function to format the output, this function generates
     a CSV file with the ordered by the keys with the key as the first column
     and the value as the second. The file can be ordered in reverse.
+    Only the first MAX_WORDS_NUMBER_CSV items are selected and sorted.
     '''
-    ordered_list = []
-
-    for key, value in dict_in.items():
-        ordered_list.append([key, value_format_function(value)])
-
-    ordered_list = sorted(ordered_list, key=sort_key_function, reverse=reverse)
+    items = ((key, value_format_function(value)) for key, value in dict_in.items())
+    ordered_list = (nlargest if reverse else nsmallest)(MAX_WORDS_NUMBER_CSV, items, key=sort_key_function)
     total = sum(dict_in.values()) if pct else 0
 
-    with open(filename, 'w', newline='', encoding=encoding) as csvfile:
+    if output_format != 'csv':
+        return write_table(filename, ([item[0], item[1], (item[1]*100)/total] if total > 0 else item
+                                      for item in ordered_list), header, output_format)
+
+    with open_output(filename, encoding=encoding) as csvfile:
         file_writer = writer(csvfile, delimiter=delimiter, quoting=QUOTE_MINIMAL)
         file_writer.writerow(header)
-        for item in ordered_list[:MAX_WORDS_NUMBER_CSV]:
+        for item in ordered_list:
             pct = (item[1]*100)/total if total > 0 else 0
             file_writer.writerow([item[0], item[1], str_pct(pct)] if pct else [item[0], item[1]])
 
+def write_table(filename, rows, header, output_format):
+    '''
+    Write rows to a Parquet or Arrow IPC file named after the
+    given CSV filename. Columns of numbers stored as strings are
+    converted to numbers, and other mixed columns to strings.
+    '''
+    df = pd.DataFrame([tuple(row) for row in rows])
+    names = []
+
+    for column in list(header) + [str(i) for i in range(len(header), len(df.columns))]:
+        column = str(column) or 'column'
+        name, i = column, 1
+        while name in names: # avoid repeated names
+            name, i = '%s_%d' % (column, i), i + 1
+        names.append(name)
+
+    if df.empty and len(df.columns) == 0:
+        df = pd.DataFrame(columns=names)
+    df.columns = names[:len(df.columns)]
+
+    for column in df.select_dtypes(include=['object', 'string']).columns:
+        try: df[column] = pd.to_numeric(df[column])
+        except (TypeError, ValueError):
+            df[column] = df[column].map(lambda x: x if x is None or isinstance(x, str) else str(x))
+
+    output_name = splitext(filename)[0] + OUTPUT_FORMATS[output_format]
+    if output_format == 'parquet':
+        df.to_parquet(output_name, index=False)
+    else: df.to_feather(output_name)
+
 def write_timeline(filename, words_per_time, list_of_words, timestamps_list, delimiter=','):
     '''
     Write timeline to output file after filling the given period.
@@ -248,36 +371,50 @@ def write_timeline(filename, words_per_time, list_of_words, timestamps_list, del
 
             file_writer.writerow(line)
 
-def write_to_csv(filename, line, delimiter, quoting):
+def write_lines_to_csv(filename, lines, delimiter=',', quoting=QUOTE_MINIMAL, writers=None):
     '''
-    Write line to file or append if file already exists.
+    Write batch of lines to file or append if file already exists,
+    through the file's writer in "writers" if given (CSVWriters),
+    or else closing the file afterwards so lines are not lost.
     '''
-    with open(filename, 'a', newline='', encoding='utf8') as csvfile:
-        file_writer = writer(csvfile, delimiter=delimiter, quoting=QUOTE_MINIMAL)
-        file_writer.writerow(line)
+    if writers is not None:
+        writers.get(filename, delimiter, quoting).writerows(lines)
+    else:
+        with open_output(filename, mode='a') as csvfile:
+            file_writer = writer(csvfile, delimiter=delimiter, quoting=quoting)
+            file_writer.writerows(lines)
+
+def write_to_csv(filename, line, delimiter, quoting, writers=None):
+    '''
+    Write line to file or append if file already exists,
+    keeping it open in "writers" if given (CSVWriters).
+    '''
+    write_lines_to_csv(filename, [line], delimiter, quoting, writers)
 
-def write_wordcloud(filename, dict_str_int_wordcount, sort_key_function=lambda t:t[1], value_key_function=lambda t:t):
+def write_wordcloud(filename, dict_str_int_wordcount, sort_key_function=lambda t:t[1], value_key_function=lambda t:t,
+                    weighted=False, delimiter=','):
     '''
     Writes the normalized dict in a txt to be pasted in wordle, Tagxedo
     or another wordcloud service. Entries in the dict_str_int_wordcount
     dictionary are in the format "string_word => integer_count",
-    eg.: "chocolate => 10000".
+    eg.: "chocolate => 10000". The dictionary is not modified.
+    If weighted, writes "word,weight" lines instead of repeating
+    each word as many times as its weight.
     '''
-    ordered_list = []
-
     if not dict_str_int_wordcount:
         return
 
-    dict_str_int_wordcount = normalize_dict(dict_str_int_wordcount)
+    max_value = max(dict_str_int_wordcount.values())
+    items = ((key, value_key_function(normalize_value(value, max_value)))
+             for key, value in dict_str_int_wordcount.items())
+    ordered_list = nlargest(MAX_WORDS_NUMBER_WORDCLOUD, items, key=sort_key_function)
 
-    for key, value in dict_str_int_wordcount.items():
-        ordered_list.append([key, value_key_function(value)])
-
-    ordered_list = sorted(ordered_list, key=sort_key_function, reverse=True)
+    if weighted:
+        with open_output(filename) as out:
+            file_writer = writer(out, delimiter=delimiter, quoting=QUOTE_MINIMAL)
+            file_writer.writerows([item[0], str_from_num(item[1])] for item in ordered_list)
+        return
 
     with open(filename, 'w', encoding= 'utf8') as out:
-        for item in ordered_list[:MAX_WORDS_NUMBER_WORDCLOUD]:
-            i = 0
-            while i < int(item[1]):
-                out.write(item[0] + ' ')
-                i+=1
\ No newline at end of file
+        for item in ordered_list:
+            out.write((item[0] + ' ') * int(item[1]))
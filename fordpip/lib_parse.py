@@ -103,7 +103,10 @@ def tweets(args):
         quoting=args['quote_format'],
         time_string=args['time_format'],
         time_zone=args['time_zone'],
-        geonames=args['geocodes'])
+        geonames=args['geocodes'],
+        workers=args['workers'],
+        output_format=args['output_format'],
+        weighted_networks=args['weighted_networks'])
     # copy README file
     copy(abspath(args['path_script']+'/man/parse_tweets.xlsx'), "LEIA-ME.xlsx")
 
@@ -164,7 +167,12 @@ def tweets_ec(args):
         quoting=args['quote_format'],
         time_string=args['time_format'],
         time_zone=args['time_zone'],
-        geonames=args['geocodes'])
+        geonames=args['geocodes'],
+        workers=args['workers'],
+        lang_cache=args['lang_cache'],
+        languages=args['language'],
+        output_format=args['output_format'],
+        weighted_networks=args['weighted_networks'])
     # copy README file
     copy(abspath(args['path_script']+'/man/parse_tweets.xlsx'), "LEIA-ME.xlsx")
 
@@ -293,7 +301,9 @@ def exportcomments(args):
     ParseComments().parse_comments(
         input_name=args['input'],
         output_name=output_path,
-        quick_parse=args['quick_parse'])
+        output_format=args['output_format'],
+        quick_parse=args['quick_parse'],
+        n_jobs=args['workers'])
 
 # image functions #
 
@@ -17,7 +17,9 @@ make the script easier to install for end users.
 
 '''
 
+import re
 import string
+import unicodedata
 
 from .lib_emojis import EMOJIS
 from .lib_stopwords import STOPWORDS
@@ -67,6 +69,35 @@ intab = ''.join(c for c in UNDESIRED_CHARACTERS)
 outtab = ''.join(' ' for c in UNDESIRED_CHARACTERS)
 punct_translate_tab = str.maketrans(intab, outtab)
 
+# translate tables for removing punctuation and accents at once
+PUNCT_DELETE_TAB = str.maketrans('', '', intab)
+PUNCT_SPECIAL_DELETE_TAB = str.maketrans('', '', ''.join(UNDESIRED_CHARACTERS_SPECIAL))
+CLEAR_WORD_TAB = {**PUNCT_DELETE_TAB, **ACCENT_REPLACEMENTS}
+
+# numbers left after removing punctuation, as in is_number()
+NUMBER_REGEX = re.compile(r'(?:\d+(?:e\d+)?|inf|infinity|nan)\Z')
+MENTION_REGEX = re.compile(r'(?<=@)[a-zA-Z0-9_]+')
+
+# emoji index: emoticons written with ASCII characters must be whole
+# tokens, while pictographs are found anywhere in a token with a trie
+EMOJI_TRIE = {}
+
+for emoji in EMOJIS:
+    if not any(character.isascii() for character in emoji):
+        node = EMOJI_TRIE
+        for character in emoji:
+            node = node.setdefault(character, {})
+        node[''] = emoji
+
+# pictograph symbols (and joiners) removed from words glued to emojis
+EMOJI_DELETE_TAB = str.maketrans('', '', ''.join(set(
+    c for e in EMOJIS for c in e if not c.isascii() and unicodedata.category(c).startswith('S')) | {'\ufe0f', '\u200d'}))
+TOKEN_TAB = {**CLEAR_WORD_TAB, **EMOJI_DELETE_TAB}
+
+WORD_REMOVE_LIST = ['rt', '\n', '', 'http', 'https', '//t', '//']
+WORD_START = ('@', '#', 'co/', '/', 'http')
+WORD_IN = ['kk', 'rsrs', 'haha', '/']
+
 def all_words_in_id(word_list, ids, text_dict):
     '''
     Check if word list present in id.
@@ -80,15 +111,12 @@ def check_word(str_s):
     '''
     Check if string is a valid word or not.
     '''
-    word_remove_list = ['rt', '\n', '', 'http', 'https', '//t', '//']
-    word_start = ['@', '#', 'co/', '/', 'http']
-    word_in = ['kk', 'rsrs', 'haha', '/']
     if len(str_s) > 1\
     and not is_number(str_s)\
     and not is_stopword(str_s)\
-    and not any(w in str_s for w in word_in)\
-    and not any(str_s.startswith(w) for w in word_start)\
-    and not str_s.lower() in word_remove_list:
+    and not any(w in str_s for w in WORD_IN)\
+    and not str_s.startswith(WORD_START)\
+    and not str_s.lower() in WORD_REMOVE_LIST:
         return True
     return False
 
@@ -96,10 +124,7 @@ def clear_word(str_s):
     '''
     Clear string from accents and punctuation.
     '''
-    str_s = str_s.lower()
-    str_s = remove_latin_accents(str_s)
-    str_s = remove_punctuation(str_s)
-    return str_s
+    return str_s.lower().translate(CLEAR_WORD_TAB)
 
 def find_word(word_list, key):
     '''
@@ -110,12 +135,55 @@ def find_word(word_list, key):
             return word_obj
     return None
 
+def find_emojis(str_s):
+    '''
+    Return all emojis found in text, in order and repeated,
+    including those glued to words or to each other.
+    '''
+    emojis = []
+    for token in str_s.split():
+        if token in EMOJIS:
+            emojis.append(token)
+        elif not token.isascii():
+            emojis.extend(find_emojis_in_token(token))
+    return emojis
+
+def find_emojis_in_token(str_s):
+    '''
+    Return all pictograph emojis found in a single token,
+    matching the longest emoji at each position of the trie.
+    '''
+    emojis = []
+    i = 0
+    while i < len(str_s):
+        node = EMOJI_TRIE.get(str_s[i])
+        if node is None:
+            i += 1
+            continue
+        emoji, end = None, i + 1
+        for j in range(i + 1, len(str_s) + 1):
+            if '' in node:
+                emoji, end = node[''], j
+            if j == len(str_s) or str_s[j] not in node:
+                break
+            node = node[str_s[j]]
+        if emoji:
+            emojis.append(emoji)
+        i = end
+    return emojis
+
 def get_emoji_value(str_s):
     '''
     Return emoji sentiment value.
     '''
     return EMOJIS[str_s]
 
+def get_emoji_values(str_s):
+    '''
+    Return sentiment values of all emojis found in text.
+    '''
+    return [EMOJIS[e] for e in find_emojis(str_s)]
+
 def get_words(str_s):
     '''
     Get clear valid words from text.
@@ -134,16 +202,15 @@ def has_emoji(str_s):
     '''
     Returns True if the input has an emoji.
     '''
-    for key in EMOJIS:
-        if key in str_s.split():
-            return True
+    if find_emojis(str_s):
+        return True
     return False
 
 def is_emoji(str_s):
     '''
     Returns True if the input is an emoji.
     '''
-    if str_s in EMOJIS.keys():
+    if str_s in EMOJIS:
         return True
     return False
 
@@ -224,22 +291,67 @@ def remove_latin_accents(str_s):
 
 def remove_punctuation(str_s):
     '''
-    This function iterates through each character in 'str_s'
-    and concatenate them in a new string if it is not in the
-    'UNDESIRED_CHARACTERS' set. It returns the given string without
-    the UNDESIRED_CHARACTERS, even if it is the empty string.
+    This function removes from 'str_s' each character in the
+    'UNDESIRED_CHARACTERS' set with a translate table. It returns
+    the given string without them, even if it is the empty string.
     '''
-    str_clean_string = ''.join(character for character in str_s if character not in UNDESIRED_CHARACTERS)
-    if str_clean_string == '': return ''
-    else: return str_clean_string
+    return str_s.translate(PUNCT_DELETE_TAB)
 
 def remove_punctuation_special(str_s):
     '''
     Same as remove_punctuation, except that this preserves the underline character.
     '''
-    str_clean_string = ''.join(character for character in str_s if character not in UNDESIRED_CHARACTERS_SPECIAL)
-    if str_clean_string == '': return ''
-    else: return str_clean_string
+    return str_s.translate(PUNCT_SPECIAL_DELETE_TAB)
+
+def tokenize(str_s):
+    '''
+    Classify and clear all tokens from text in a single pass,
+    returning emojis (repeated) and sets of hashtags, mentions,
+    URLs, words and capitalized words, as used in parse_tweets.
+    '''
+    emojis = []
+    hashtags = set()
+    mentions = set()
+    urls = set()
+    words = set()
+    words_capitalized = set()
+
+    for token in str_s.split():
+
+        if token in EMOJIS:
+            emojis.append(token)
+            continue
+
+        if not token.isascii():
+            emojis.extend(find_emojis_in_token(token))
+
+        first = token[0]
+        truncated = token.endswith('…')
+
+        if first == '#' and not truncated:
+            hashtag = token.lower().translate(TOKEN_TAB)
+            hashtags.add('#'+hashtag) if hashtag else None
+
+        elif (first == '@' or first == '＠') and not truncated:
+            mention = MENTION_REGEX.findall(token)
+            mentions.add(mention[0]) if len(mention) == 1 else None
+
+        elif (first == 'h' and token[1:2] in ('t', 'r')) and not truncated:
+            urls.add(token)
+
+        else: # common word, same as check_word()
+            word = token.lower().translate(TOKEN_TAB)
+            if len(word) > 1\
+            and not NUMBER_REGEX.match(word)\
+            and word not in STOPWORDS\
+            and not any(w in word for w in WORD_IN)\
+            and not word.startswith(WORD_START)\
+            and word not in WORD_REMOVE_LIST:
+                words.add(word)
+                if token == token.capitalize():
+                    words_capitalized.add(word.capitalize())
+
+    return emojis, hashtags, mentions, urls, words, words_capitalized
 
 def unencode(str_s, encoding='ascii'):
     '''
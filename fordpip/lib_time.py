@@ -7,11 +7,28 @@ creating timelines, counting occurrences by interval,
 calculating elapsed timea d setting time zones.
 '''
 
-from collections import defaultdict
+from collections import defaultdict, Counter
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from itertools import groupby
 from time import time, sleep
 
+DATE_CACHE_SIZE = 65536
+PERIOD_CACHE_SIZE = 4 * 24 * 366 * 2 # two years of 15 minutes buckets
+
+EPOCH = datetime(1970, 1, 1)
+
+ISO_DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S']
+
+# lengths and separators (every third character from the fifth)
+# of strings read by datetime.fromisoformat() as strptime() would
+ISO_DATE_SHAPES = {
+    '%Y-%m-%d': ((10,), '--'),
+    '%Y-%m-%d %H:%M:%S': ((19,), '-- ::'),
+    '%Y-%m-%d %H:%M:%S.%f': ((23, 26), '-- ::.'),
+    '%Y-%m-%dT%H:%M:%S': ((19,), '--T::'),
+}
+
 def count_by_date(dict_by_date, str_date, str_var):
     '''
     Adds a date to the dates dictionary and the
@@ -113,6 +130,19 @@ def get_local_tz():
     time_utc = datetime_from_timestamp(time_now, utc=True).timestamp()
     return (time_local-time_utc)
 
+def get_period_seconds(str_format):
+    '''
+    Return smallest time unit in a date format as seconds,
+    eg. 3600 for "%d/%m/%Y %H" or 86400 for "%d/%m/%Y".
+    '''
+    if any(x in str_format for x in ['%S', '%f', '%s', '%c', '%T', '%X']):
+        return 1
+    if any(x in str_format for x in ['%M', '%R']):
+        return 60
+    if any(x in str_format for x in ['%H', '%I', '%p']):
+        return 3600
+    return 86400
+
 def get_time_diff(max_date, min_date):
     '''
     Return seconds elapsed during set period.
@@ -135,6 +165,30 @@ def get_time_elapsed(start_time, time_as_int=False):
     time_elapsed = str(timedelta(seconds=time_elapsed))
     return time_elapsed
 
+def infer_date_format(samples, formats=ISO_DATE_FORMATS):
+    '''
+    Return format matching most of the given date strings,
+    or the first format if none of them match.
+    '''
+    counter = Counter()
+    for str_format in formats:
+        for str_date in samples:
+            try: datetime.strptime(str_date, str_format)
+            except ValueError: continue
+            counter[str_format] += 1
+    return max(formats, key=lambda x: counter[x])
+
+def period_from_timestamp(timestamp, tz=None, str_format='%d/%m/%Y'):
+    '''
+    Return date string of the period a timestamp belongs to,
+    formatting each period only once. Local times are grouped
+    in 15 minutes buckets, as time zones are multiples of it.
+    '''
+    seconds = get_period_seconds(str_format)
+    if tz != 0: # local or given time zone
+        seconds = min(seconds, 900)
+    return str_from_period(int(timestamp) // seconds, seconds, tz, str_format)
+
 def set_time_zone(seconds=None):
     '''
     Return seconds as int for time zone or local time.
@@ -161,6 +215,33 @@ def sleep_seconds(tts):
         print('.')
     sleep(tts)
 
+@lru_cache(maxsize=PERIOD_CACHE_SIZE)
+def str_from_period(period, seconds, tz=None, str_format='%d/%m/%Y'):
+    '''
+    Return date string of the given period number.
+    '''
+    return datetime_to_str(datetime_from_timestamp(period * seconds, tz), str_format)
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def timestamp_from_str(str_date, str_format='%Y-%m-%d %H:%M:%S', offset=0):
+    '''
+    Convert date string in a fixed offset from UTC (seconds) to
+    timestamp as int, eg. "2016-02-16 17:38:53" to 1455644333.
+    Setting offset to None reads it as local machine time,
+    with the offset in effect at that date (eg. summer time).
+    Results are cached, as dates are often repeated in datasets.
+    '''
+    date = None
+    lengths, separators = ISO_DATE_SHAPES.get(str_format, ((), ''))
+    if len(str_date) in lengths and str_date[4:20:3] == separators: # fast path
+        try: date = datetime.fromisoformat(str_date)
+        except ValueError: pass
+    if date is None:
+        date = datetime.strptime(str_date, str_format)
+    if date.tzinfo or offset is None: # offset set in string or local
+        return int(date.timestamp())
+    return (date - EPOCH) // timedelta(seconds=1) - int(offset)
+
 def time_period_grouper(start_date, some_date):
     '''
     Function used to group by day.
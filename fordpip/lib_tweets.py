@@ -0,0 +1,1310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+This module contains the accumulator used for analyzing
+tweets datasets, largely used by the "parse-tweets" script.
+
+Counters, sets and networks are kept in a single object that
+can be merged with others, so each shard of an input file can
+be parsed in its own process and reduced at the end.
+
+Lines are read through an adapter, which maps each supported
+schema (flashback, YourTwapperKeeper, Gephi edges network and
+ExportComments) to the columns expected by the accumulator.
+'''
+
+from collections import defaultdict
+from csv import reader, writer, QUOTE_MINIMAL, QUOTE_NONE
+from functools import partial, reduce
+from heapq import heappush, heappushpop
+from multiprocessing import Pool
+from re import findall
+
+from .lib_gender import gender_identify_list
+from .lib_geo import get_geoname, load_geonames
+from .lib_headers import TWEETS_HEADER, TWITTER_USERS_HEADER, YTK_HEADER
+from .lib_input import *
+from .lib_lang import detect_lang, detect_langs, load_lang_cache
+from .lib_output import open_output, write_gdf, write_set, write_table, write_values, write_wordcloud
+from .lib_text import *
+from .lib_time import *
+
+ADS_SOURCES = ['advertiser-interface', 'Twitter for Advertisers', 'Twitter Ads',
+    'simpleads-ui', 'Sprinklr', 'Sprinklr Publishing', 'CTW AMS']
+
+EC_DATE_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%d/%m/%y %H:%M:%S', '%d/%m/%Y %H:%M:%S']
+
+MAX_TOP_TWEETS_BY_DATE = 10
+
+class TweetsAdapter(object):
+    '''
+    Read lines from flashback datasets.
+    '''
+    metadata = True # quotes, replies, media and places
+    nodes = True # user followers and following
+    nodes_engagement = False # user retweets and engagement
+    top_tweets_by_date = False
+
+    def __init__(self, input_name, delimiter=',', quoting=QUOTE_MINIMAL):
+        self.columns = get_file_header(input_name)
+        with open(input_name, 'rt', encoding='utf8') as input_file:
+            self.header = next(reader(input_file, delimiter=delimiter, quoting=quoting))
+
+    def fix_line(self, line):
+        '''
+        Return line with known length issues fixed.
+        '''
+        return line
+
+    def get_id(self, data):
+        '''
+        Return tweet ID used to avoid duplicates.
+        '''
+        return data['id']
+
+    def get_top_tweet(self, data, tid, text):
+        '''
+        Return metadata of tweet, or of the
+        retweeted one, for top tweets.
+        '''
+        user_posting = data['rt_user'] if 'rt_user' in data else data['from_user']
+        return {'text': text,
+                'from_user': user_posting,
+                'hashtags': data['hashtags'], # serialized on output
+                'rt_count': data['rt_count'],
+                'favorite_count': data['favorite_count'],
+                'type': data['type'],
+                'lang': data['lang'],
+                'place': data['place'],
+                'country': data['country'],
+                'source': data['source'],
+                'media': data['media_url'] if data['media_url'] else data['urls'],
+                'created_at': data['created_at'],
+                'url': 'https://www.twitter.com/'+user_posting+'/status/'+tid}
+
+    def get_url(self, data, user_name):
+        '''
+        Return URL of tweet.
+        '''
+        return 'https://www.twitter.com/' + user_name + '/status/' + data['id']
+
+    def merge(self, other):
+        '''
+        Merge state from an adapter used by another accumulator.
+        '''
+        pass
+
+    def prepare(self, lines):
+        '''
+        Prepare a chunk of lines before they are read.
+        '''
+        pass
+
+    def read(self, data):
+        '''
+        Return data with values in flashback columns.
+        '''
+        # timestamp fix
+        if 'timestamp' in self.columns:
+            data['time'] = data['timestamp']
+
+        # clean line breaks from text
+        for text in ['text', 'rt_text', 'quoted_text']:
+            if text in data: # check for field data first
+                data[text] = data[text].replace('\n', ' ').replace('\r', ' ')
+
+        # grab full text workaround
+        if data['text'].endswith('…')\
+        and data['text'].startswith('RT @'):
+          try: # expand from retweeted text
+            a,b = data['text'].rstrip('…').split(': ',1)
+            if 'rt_text' in data and data['rt_text'].startswith(b):
+                data['text'] = str(a+': '+data['rt_text'])
+          except: pass
+
+        return data
+
+    def skip(self, data):
+        '''
+        Return reason to skip line, if any.
+        '''
+        return None
+
+class ExportCommentsAdapter(TweetsAdapter):
+    '''
+    Read lines from ExportComments datasets.
+    '''
+    metadata = False
+    nodes_engagement = True
+    top_tweets_by_date = True
+
+    def __init__(self, input_name, delimiter=',', quoting=QUOTE_MINIMAL, languages=None, lang_cache=None):
+        columns = get_file_header(input_name, title=True)
+        columns[0] = 'lineid'
+        self.columns = {x.lower().replace('.','_').replace(' ','_'): i for i,x in enumerate(columns)}
+        self.languages = languages
+        self.dict_lang = load_lang_cache(lang_cache)
+        with open(input_name, 'rt', encoding='utf8') as input_file:
+            file_reader = reader(input_file, delimiter=delimiter, quoting=quoting)
+            self.header = next(file_reader)
+            # infer date format from a sample
+            n = self.columns['date']
+            samples = [line[n] for line, i in zip(file_reader, range(100)) if len(line) > n]
+        self.date_format = infer_date_format(samples, EC_DATE_FORMATS)
+        self.offset = None # dates read as local time
+        if len(self.header) == 20:
+            self.header = self.header + ['Profile URL']
+
+    def fix_line(self, line):
+        if len(line) == 20:
+            line = line + ['']
+        if len(line) == 22 and line[21].startswith('https://'):
+            line = line[:-1]
+        return line
+
+    def get_id(self, data):
+        return data['tweet_id_(click_to_view_url)'].replace('ID: ','')
+
+    def get_top_tweet(self, data, tid, text):
+        return {'text': text,
+                'from_user': data['from_user'].lower(),
+                'hashtags': data['hashtags'], # serialized on output
+                'rt_count': data['rt_count'],
+                'favorite_count': data['favorite_count'],
+                'type': data['type'],
+                'lang': data['lang'],
+                'place': data['author_location'],
+                'country': '',
+                'source': data['source'],
+                'media': '',
+                'created_at': data['created_at'],
+                'url': data['status_url']}
+
+    def get_url(self, data, user_name):
+        return data['status_url']
+
+    def merge(self, other):
+        self.dict_lang.update(other.dict_lang)
+
+    def prepare(self, lines):
+        if not self.languages:
+            return # no filter
+        # detect languages in a single batch
+        texts = []
+        n_source = self.columns['tweet_source']
+        n_text = self.columns['tweet_text']
+        for line in lines:
+            line = self.fix_line(line)
+            if len(line) == len(self.header) and line[n_source] not in ADS_SOURCES:
+                texts.append(line[n_text])
+        detect_langs(texts, self.dict_lang)
+
+    def read(self, data):
+        # clean line breaks from text
+        for text in ['tweet_text', 'author_bio', 'author_location']:
+            data[text] = data[text].replace('\n', ' ').replace('\r', ' ')
+
+        # convert date string to timestamp
+        try: data['time'] = timestamp_from_str(data['date'], self.date_format, self.offset)
+        except ValueError: # other format in the same file
+            str_format = infer_date_format([data['date']], EC_DATE_FORMATS)
+            data['time'] = timestamp_from_str(data['date'], str_format, self.offset)
+
+        # set matching keys
+        data['id'] = self.get_id(data)
+        data['text'] = data['tweet_text']
+        data['from_user'] = data['username']
+        data['source'] = data['tweet_source']
+        data['created_at'] = data['date']
+        data['rt_count'] = data['retweets'] or 0
+        data['favorite_count'] = data['favorites'] or 0
+        data['comments'] = data['comments'] or 0
+        data['user_full_name'] = data['name']
+        data['user_image_url'] = data['author_image']
+        data['user_tweets'] = data['author_statuses']
+        data['user_followers'] = data['author_followers'] or 0
+        data['user_following'] = data['author_friends'] or 0
+        data['user_favorited'] = data['author_favorites']
+        data['user_location'] = data['author_location']
+        data['user_description'] = data['author_bio']
+        data['user_verified'] = data['author_verified']
+        # expand default values
+        data['place'] = ''
+        data['country'] = ''
+        data['media_url'] = ''
+        data['type'] = 'tweet'
+
+        # check if retweet
+        if data['text'].endswith('…') and data['text'].startswith('RT @'):
+          try: # expand from retweeted text
+            a,b = data['text'].rstrip('…').split(': ',1)
+            data['rt_user'] = a.replace('RT @','')
+            data['text'] = b
+            data['type'] = 'retweet'
+          except: pass
+
+        # check if @-message
+        if data['text'].startswith('@'):
+            data['type'] = 'reply'
+            data['reply_to_user'] = data['text'].split()[0].replace('@','')
+
+        if data['is_retweet?'] == 'yes':
+            data['type'] = 'retweet'
+
+        data['rt_text'] = data['text']
+        return data
+
+    def skip(self, data):
+        # Ads: Twitter for Advertisers, advertiser-interface, Sprinklr Publishing, Twitter Ads, simpleads-ui, Sprinklr, CTW AMS.
+        if data['tweet_source'] in ADS_SOURCES:
+            return 'ads'
+
+        # filter by language
+        if self.languages:
+            data['lang'] = detect_lang(data['tweet_text'], self.dict_lang)
+            if data['lang'] not in self.languages:
+                return 'different language'
+        else: data['lang'] = 'und'
+
+class GephiAdapter(TweetsAdapter):
+    '''
+    Read lines from Gephi edges network datasets.
+    '''
+    metadata = False
+    nodes = False
+
+    def read(self, data):
+        data = TweetsAdapter.read(self, data)
+        # expand default values
+        data['place'] = ''
+        data['country'] = ''
+        data['media_url'] = ''
+        data['created_at'] = ''
+        data['lang'] = 'und'
+        # set matching keys
+        data['id'] = data['tweet_id']
+        data['from_user'] = data['source']
+        # set target if @-message
+        if data['type'] == 'reply':
+            data['reply_to_user'] = data['target']
+        # set target if retweet
+        elif data['type'] == 'retweet':
+            data['rt_user'] = data['target']
+        # set target if quoted
+        elif data['type'] == 'quote':
+            data['quoted_user'] = data['target']
+        # set target if mention
+        elif data['type'] == 'mention':
+            data['mentions_user'] = [data['target']]
+        return data
+
+class YourTwapperKeeperAdapter(TweetsAdapter):
+    '''
+    Read lines from YourTwapperKeeper (legacy) datasets.
+    '''
+    metadata = False
+
+    def read(self, data):
+        data = TweetsAdapter.read(self, data)
+        # expand default values
+        if not 'user_followers' in data:
+            data['user_followers'] = 0
+            data['user_following'] = 0
+        for key in ['hashtags', 'mentions_user', 'urls']:
+            data.pop(key, None) # read from text
+        data['lang'] = 'und'
+        data['rt_id'] = ''
+        data['rt_text'] = data['text']
+        data['rt_count'] = 0
+        data['favorite_count'] = 0
+        data['type'] = 'tweet'
+        # check if classic @-message
+        if data['text'].startswith('@'):
+            data['type'] = 'reply'
+            data['reply_to_user'] = data['text'].split(' ', 1)[0][1:].lower()
+        # check if classic retweet
+        elif data['text'].startswith('RT @'):
+            data['type'] = 'retweet'
+            data['rt_user'] = data['text'].split(':', 1)[0][4:].lower()
+        return data
+
+class TweetAccumulator(object):
+    '''
+    Accumulate statistics from tweets, line by line.
+    '''
+    def __init__(self, adapter, tz=0, time_string='%d/%m/%Y',
+        geonames=None, consider=None, skip_ids=None, weighted_networks=False):
+        self.adapter = adapter
+        self.tz = tz
+        self.time_string = time_string
+        self.geonames = geonames
+        self.consider = consider
+        self.weighted_networks = weighted_networks
+
+        # empty time vars
+        self.min_id = None
+        self.max_id = None
+        self.min_timestamp = None
+        self.max_timestamp = None
+
+        # zero int counters
+        self.int_corrupted_lines = 0
+        self.int_duplicate_lines = 0
+        self.int_global_favorites = 0
+        self.int_global_retweets = 0
+        self.int_global_sentiment = 0
+        self.int_top_tweets_read = 0
+        self.int_total_lines = 0
+
+        # empty lists
+        self.locations = []
+        self.users = []
+        self.users_nodes = []
+
+        # empty sets
+        self.set_dates = set()
+        self.set_tids = set()
+        self.set_tweet_ids = set()
+        self.set_skip_ids = set(skip_ids) if skip_ids else set() # read before, not counted
+        self.set_users_all = set()
+        self.set_users_tweeting = set()
+
+        # empty dictionaries
+        self.dict_tweets = {}
+
+        # edge lists sharing sanitized values,
+        # counted by pair if weighted
+        self.network_values = ValuePool()
+        self.dict_networks = defaultdict(partial(WeightedEdgeList if weighted_networks else EdgeList,
+                                                 self.network_values))
+
+        # (rt_count, -order, tweet_id, line) heaps by day
+        self.top_tweets_by_date = defaultdict(list)
+
+        # empty int dictionaries
+        self.dict_int_countries = defaultdict(int)
+        self.dict_int_emojis = defaultdict(int)
+        self.dict_int_favorites = defaultdict(int)
+        self.dict_int_hashtags = defaultdict(int)
+        self.dict_int_lang = defaultdict(int)
+        self.dict_int_media = defaultdict(int)
+        self.dict_int_places = defaultdict(int)
+        self.dict_int_quotes = defaultdict(int)
+        self.dict_int_replies = defaultdict(int)
+        self.dict_int_retweets = defaultdict(int)
+        self.dict_int_sentiment = defaultdict(int)
+        self.dict_int_skipped = defaultdict(int)
+        self.dict_int_source = defaultdict(int)
+        self.dict_int_text = defaultdict(int)
+        self.dict_int_total = defaultdict(int)
+        self.dict_int_tweets = defaultdict(int)
+        self.dict_int_type = defaultdict(int)
+        self.dict_int_urls = defaultdict(int)
+
+        # times, favorited and retweeted by word
+        self.words = CounterStore(['times', 'favorited', 'retweeted'])
+        self.words_capitalized = CounterStore(['times', 'favorited', 'retweeted'])
+
+        # tweets, original tweets, retweets and favorites by user
+        self.users_stats = CounterStore(['tweets', 'original', 'retweets', 'favorites'])
+
+        # empty set dictionaries
+        self.dict_set_hashtags = defaultdict(set)
+        self.dict_set_media = defaultdict(set)
+        self.dict_set_urls = defaultdict(set)
+        self.dict_set_tweets_date = defaultdict(set)
+
+        # occurrences by period
+        self.dicts_int_hashtags_by_date = defaultdict(partial(defaultdict, int))
+        self.dicts_int_words_by_date = defaultdict(partial(defaultdict, int))
+
+        # tweet, hashtag, sentiment, retweet, reply, quote, mention
+        self.dicts_int_dates = defaultdict(partial(defaultdict, int))
+
+        # retweet, reply, quote, mention
+        self.dicts_int_receiving = defaultdict(partial(defaultdict, int))
+        self.dicts_int_sending = defaultdict(partial(defaultdict, int))
+
+        # retweet, reply, quote, mention, all
+        self.dicts_set_receiving = defaultdict(partial(defaultdict, set))
+        self.dicts_set_sending = defaultdict(partial(defaultdict, set))
+
+    def add_interaction(self, data, user_name, str_target, str_type):
+        '''
+        Count sent and received interactions and add them to network.
+        '''
+        # count sent interactions
+        self.dicts_int_sending[str_type][user_name] += 1
+        self.dicts_set_sending[str_type][user_name].add(str_target)
+        self.dicts_set_sending['all'][user_name].add(str_target)
+        # count received interactions
+        self.dicts_int_receiving[str_type][str_target] += 1
+        self.dicts_set_receiving[str_type][str_target].add(user_name)
+        self.dicts_set_receiving['all'][str_target].add(user_name)
+        # add interacton to network (AT/MT/QT/RT)
+        letter = str_type[:1].upper() if str_type != 'reply' else 'A'
+        add_to_network(self.dict_networks[letter+'Ts'],
+           [user_name, str_target, str_type, data['id'], data['text'],
+           data['favorite_count'], data['rt_count'], data['time']])
+
+    def add_top_tweet(self, heap, tweet):
+        '''
+        Keep tweet in heap if among the most retweeted,
+        or the first read if retweeted the same times.
+        '''
+        if len(heap) < MAX_TOP_TWEETS_BY_DATE:
+            heappush(heap, tweet)
+        else: heappushpop(heap, tweet)
+
+    def add_line(self, line, line_num=0):
+        '''
+        Check line length and add its data to counters.
+        '''
+        header = self.adapter.header
+        line = self.adapter.fix_line(line)
+
+        # avoid uneven length lines
+        if len(line) != len(header):
+            print('Warning: line', str(line_num) + ',', 'list index got', len(line), 'and expected', len(header), 'columns.')
+            self.int_corrupted_lines += 1
+            return
+
+        elif line == header:
+            print('Warning: line', str(line_num) + ',', 'duplicate header.')
+            return
+
+        try: # analyze
+            self.add_data(read_line(line, self.adapter.columns), line)
+        except Exception as e:
+            print('Warning: line', str(line_num) + ',', str(e) + '.')
+            self.int_corrupted_lines += 1
+
+    def add_lines(self, lines):
+        '''
+        Add a chunk of line numbers and lines to counters.
+        '''
+        self.adapter.prepare([line for line_num, line in lines])
+        for line_num, line in lines:
+            time_to_print(line_num)
+            self.add_line(line, line_num)
+
+    def add_data(self, data, line=None):
+        '''
+        Add tweet data read from line to counters.
+        '''
+        adapter = self.adapter
+        geonames = self.geonames
+        ccode = None
+        geo_name = False
+        has_emoji = False
+        target = None
+        sent_value = 0
+
+        # avoid ads and filtered tweets
+        reason = adapter.skip(data)
+        if reason:
+            self.dict_int_skipped[reason] += 1
+            return # skip
+
+        # avoid duplicates
+        tweet_id = adapter.get_id(data)
+        if tweet_id in self.set_tweet_ids or tweet_id in self.set_skip_ids:
+            self.int_duplicate_lines += 1
+            return # skip
+        self.set_tweet_ids.add(tweet_id)
+
+        # parse only tweets containing value
+        if self.consider and self.consider in data:
+            if data[self.consider] == '':
+                return # skip
+
+        # map to flashback columns
+        data = adapter.read(data)
+
+        # get ID range
+        if not self.min_id or int(data['id']) < self.min_id:
+            self.min_id = int(data['id'])
+        if not self.max_id or int(data['id']) > self.max_id:
+            self.max_id = int(data['id'])
+
+        # get timestamp range
+        data['time'] = int(data['time'])
+        if not self.min_timestamp or data['time'] < self.min_timestamp:
+            self.min_timestamp = data['time']
+        if not self.max_timestamp or data['time'] > self.max_timestamp:
+            self.max_timestamp = data['time']
+
+        # get date
+        str_date = period_from_timestamp(data['time'], self.tz, self.time_string)
+        self.set_dates.add(str_date)
+
+        # keep line for top tweets by date
+        if adapter.top_tweets_by_date:
+            str_date_short = period_from_timestamp(data['time'], self.tz, '%Y-%m-%d')
+            if int(data['comments']) > 0: # with replies
+                self.add_top_tweet(self.top_tweets_by_date[str_date_short],
+                    (int(data['rt_count']), -self.int_top_tweets_read, data['id'], tuple(line)))
+                self.int_top_tweets_read += 1
+
+        # lowercase type
+        data['type'] = data['type'].lower()
+
+        # avoid bugs on legacy datasets
+        if 'rt_text' not in data and int(data['rt_count']) > 0:
+            data['rt_text'] = data['text']
+
+        # text and sentiment
+        emojis, hashtags, mentions_user, urls, words_read, words_capitalized_read = tokenize(data['text'])
+
+        for word in emojis:
+            has_emoji = True
+            sent_value += get_emoji_value(word)
+            self.dict_int_emojis[word] += 1
+
+        # read from text if missing
+        for key, values in [('hashtags', hashtags), ('mentions_user', mentions_user), ('urls', urls)]:
+            if key not in data:
+                data[key] = values
+
+        if has_emoji:
+            self.dicts_int_dates['sentiment'][str_date] += sent_value
+            self.dict_int_sentiment[data['text']] = sent_value
+            self.dict_int_total['emoji'] += 1
+            self.int_global_sentiment += sent_value
+
+        for word in words_read:
+            self.words.add(word, 'times')
+            self.words.add(word, 'favorited', int(data['favorite_count']))
+            self.dicts_int_words_by_date[str_date][word] += 1
+
+        for word in words_capitalized_read:
+            self.words_capitalized.add(word, 'times')
+            self.words_capitalized.add(word, 'favorited', int(data['favorite_count']))
+
+        # get user_name
+        user_name = data['from_user'].lower()
+        self.set_users_all.add(user_name)
+
+        # get tweet URL
+        tweet_url = adapter.get_url(data, user_name)
+
+        # add retweet metadata to dictionary
+        tid = data['rt_id'] if 'rt_id' in data else data['id']
+        engagement = int(data['rt_count']) + int(data['favorite_count'])
+        ttext = data['rt_text'] if 'rt_text' in data else data['text']
+
+        if engagement > 0 and (tid not in self.set_tids):
+            self.set_tids.add(tid) # avoid duplicates
+            self.dict_int_tweets[tid] = engagement
+            self.dict_tweets[tid] = adapter.get_top_tweet(data, tid, ttext)
+
+        # add user metadata to set
+        if user_name not in self.set_users_tweeting:
+            self.users.append([data.get(i) for i in TWITTER_USERS_HEADER])
+            if adapter.nodes_engagement: # retweets added on output
+                self.users_nodes.append([user_name, int(data['user_followers']), int(data['user_following']), engagement])
+            elif adapter.nodes:
+                self.users_nodes.append([user_name, int(data['user_followers']), int(data['user_following'])])
+            self.set_users_tweeting.add(user_name)
+
+        # calculate statistics
+        self.dicts_int_dates[data['type']][str_date] += 1
+        self.dict_int_text[ttext] += 1
+        self.dict_int_lang[data['lang']] += 1
+        self.dict_int_source[data['source']] += 1
+        self.dict_int_type[data['type']] += 1
+        self.users_stats.add(user_name, 'tweets')
+        self.dict_set_tweets_date[str_date].add(user_name)
+
+        # original tweets
+        if data['type'] == 'tweet':
+            # count original tweets
+            self.users_stats.add(user_name, 'original')
+            # count word retweeted times
+            for word in words_read:
+                self.words.add(word, 'retweeted', int(data['rt_count']))
+            for word in words_capitalized_read:
+                self.words_capitalized.add(word, 'retweeted', int(data['rt_count']))
+
+        # count retweets and replies
+        if data['type'] in ('retweet', 'reply', 'quote'):
+            target = data['rt_user'] if data['type'] == 'retweet' else data['reply_to_user']
+            target = data['quoted_user'] if data['type'] == 'quote' else target
+            self.add_interaction(data, user_name, target.lower(), data['type'])
+            self.set_users_all.add(target.lower())
+
+        # get retweeted value from Twitter
+        if data['rt_count'] and int(data['rt_count']) > 0:
+            self.int_global_retweets += int(data['rt_count']) if data['type'] != 'retweet' else 0
+            self.users_stats.add(user_name, 'retweets', int(data['rt_count']) if data['type'] != 'retweet' else 0)
+            self.dict_int_retweets[data['rt_text']] = int(data['rt_count'])
+
+        # get likes/favorites value from Twitter
+        if data['favorite_count'] and int(data['favorite_count']) > 0:
+            self.int_global_favorites += int(data['favorite_count'])
+            self.users_stats.add(user_name, 'favorites', int(data['favorite_count']))
+            self.dict_int_favorites[data['text']] += int(data['favorite_count'])
+
+        # count mentions
+        if data['mentions_user']:
+            self.dict_int_total['mention'] += 1
+            mentions_list = str_to_list(data['mentions_user'])\
+                if isinstance(data['mentions_user'], str) else data['mentions_user']
+
+            for mention in mentions_list:
+                mention = remove_punctuation_special(mention).lower()
+
+                if mention != target:
+                    self.dicts_int_dates['mention'][str_date] += 1
+                    self.add_interaction(data, user_name, mention, 'mention')
+                    self.set_users_all.add(mention)
+
+        # count hashtags
+        if data['hashtags']:
+            self.dict_int_total['hashtag'] += 1
+            hashtags_list = str_to_list(data['hashtags'])\
+                if isinstance(data['hashtags'], str) else data['hashtags']
+            valid_hashtags = []
+
+            for hashtag in hashtags_list:
+                valid_hashtags.append('#'+clear_word(hashtag.lower()))
+
+            for hashtag in valid_hashtags:
+                self.dicts_int_dates['hashtag'][str_date] += 1
+                self.dicts_int_hashtags_by_date[str_date][hashtag] += 1
+                add_to_dicts(hashtag, self.dict_int_hashtags, dict_set=self.dict_set_hashtags, item=user_name)
+                add_to_network(self.dict_networks['hashtags_users'], [user_name, hashtag])
+
+            for combination in list_combinations(valid_hashtags):
+                add_to_network(self.dict_networks['hashtags'], [combination[0], combination[1]])
+
+        # count URLs
+        if data['urls']:
+            self.dict_int_total['url'] += 1
+            urls_list = str_to_list(data['urls'], separator=', ')\
+                if isinstance(data['urls'], str) else data['urls']
+            for url in urls_list:
+                try: # each
+                    url_domain = findall(r'(?<=://)[a-zA-Z0-9_.]+', url)[0].replace('www.','')
+                    add_to_dicts(url, self.dict_int_urls, dict_set=self.dict_set_urls, item=user_name)
+                    add_to_network(self.dict_networks['URLs_full'], [user_name, url])
+                    add_to_network(self.dict_networks['URLs'], [user_name, url_domain])
+                    if any(u in url for u in ['facebook.com', 'fb.me']):
+                        add_to_network(self.dict_networks['URLs_facebook'], [user_name, url])
+                    if any (u in url for u in ['youtube.com', 'youtu.be']):
+                        add_to_network(self.dict_networks['URLs_youtube'], [user_name, url])
+                except: pass
+
+        if not adapter.metadata:
+            return # skip
+
+        # get most quoted ID
+        if data['type'] == 'quote':
+            self.dict_int_quotes[data['quoted_text']] += 1
+
+        # get most replied ID
+        if data['type'] == 'reply':
+            self.dict_int_replies[data['reply_to_id']] += 1
+
+        # count embedded media
+        if data['media_url']:
+            self.dict_int_total['media_url'] += 1
+            add_to_dicts(data['media_url'], self.dict_int_media, dict_set=self.dict_set_media, item=user_name)
+
+        # count location
+        if data['place']:
+            self.dict_int_total['place'] += 1
+            self.dict_int_countries[data['country']] += 1
+            self.dict_int_places[data['place'] + ' (' + data['country'] + ')'] += 1
+            geo_name = data['place'].split(',')[0].replace(',','').replace('-','').lower()
+            ccode = data['country_code'] if 'country_code' in data else None
+
+        # count geocode locations by Twitter
+        if data['geo_type'].lower() == 'point':
+            self.dict_int_total['geocode'] += 1
+            # append coordinates to locations output file
+            self.locations.append([data['latitude'], data['longitude'], 'point', data['place'],
+                                   data['country'], ccode, data['lang'], data['time'], data['from_user'],
+                                   data['text'], data['user_image_url'], tweet_url])
+
+        # try and match reverse geocode by country
+        elif geo_name and geonames\
+        and geonames.lookup(ccode, geo_name):
+            self.dict_int_total['in_geonames'] += 1
+            latitude, longitude, geoname, = get_geoname(geo_name, geonames, ccode)
+            # append coordinates to locations output file
+            self.locations.append([latitude, longitude, geoname, data['place'],
+                                   data['country'], ccode, data['lang'], data['time'], data['from_user'],
+                                   data['text'], data['user_image_url'], tweet_url])
+
+    def merge(self, other):
+        '''
+        Merge counters from another accumulator, which is
+        expected to have read the lines following this one's.
+        Tweets read before should be given to it as "skip_ids".
+        '''
+        # adapter cache
+        self.adapter.merge(other.adapter)
+
+        # time and ID range
+        for key, function in [('min_id', min), ('max_id', max), ('min_timestamp', min), ('max_timestamp', max)]:
+            values = [x for x in [getattr(self, key), getattr(other, key)] if x]
+            setattr(self, key, function(values) if values else None)
+
+        # int counters
+        self.int_corrupted_lines += other.int_corrupted_lines
+        self.int_duplicate_lines += other.int_duplicate_lines
+        self.int_global_favorites += other.int_global_favorites
+        self.int_global_retweets += other.int_global_retweets
+        self.int_global_sentiment += other.int_global_sentiment
+        self.int_total_lines += other.int_total_lines
+
+        # top tweets read after this one's
+        for date, tweets in other.top_tweets_by_date.items():
+            for rt_count, order, tweet_id, line in tweets:
+                self.add_top_tweet(self.top_tweets_by_date[date],
+                    (rt_count, order - self.int_top_tweets_read, tweet_id, line))
+        self.int_top_tweets_read += other.int_top_tweets_read
+
+        # lists and networks keep reading order
+        self.locations.extend(other.locations)
+        ids = self.network_values.merge(other.network_values)
+        for key, edges in other.dict_networks.items():
+            self.dict_networks[key].extend(edges, ids)
+
+        # users are written as first seen
+        for user, user_node in zip(other.users, other.users_nodes or [None]*len(other.users)):
+            user_name = user[0].lower()
+            if user_name not in self.set_users_tweeting:
+                self.users.append(user)
+                self.users_nodes.append(user_node) if user_node else None
+                self.set_users_tweeting.add(user_name)
+
+        # tweets metadata is kept as first seen
+        for tid, tweet in other.dict_tweets.items():
+            if tid not in self.set_tids:
+                self.dict_int_tweets[tid] = other.dict_int_tweets[tid]
+                self.dict_tweets[tid] = tweet
+                self.set_tids.add(tid)
+
+        # sets
+        for key in ['set_dates', 'set_tweet_ids', 'set_users_all']:
+            getattr(self, key).update(getattr(other, key))
+
+        # values set by last seen
+        self.dict_int_retweets.update(other.dict_int_retweets)
+        self.dict_int_sentiment.update(other.dict_int_sentiment)
+
+        # int dictionaries
+        for key in ['dict_int_countries', 'dict_int_emojis',
+                    'dict_int_favorites', 'dict_int_hashtags', 'dict_int_lang', 'dict_int_media',
+                    'dict_int_places', 'dict_int_quotes',
+                    'dict_int_replies', 'dict_int_skipped', 'dict_int_source', 'dict_int_text', 'dict_int_total',
+                    'dict_int_type', 'dict_int_urls']:
+            merge_dicts(getattr(self, key), getattr(other, key))
+
+        # counter stores
+        for key in ['words', 'words_capitalized', 'users_stats']:
+            getattr(self, key).merge(getattr(other, key))
+
+        # set dictionaries
+        for key in ['dict_set_hashtags', 'dict_set_media', 'dict_set_urls', 'dict_set_tweets_date']:
+            merge_dicts(getattr(self, key), getattr(other, key))
+
+        # dictionaries of dictionaries
+        for key in ['dicts_int_hashtags_by_date', 'dicts_int_words_by_date', 'dicts_int_dates',
+                    'dicts_int_receiving', 'dicts_int_sending',
+                    'dicts_set_receiving', 'dicts_set_sending']:
+            for subkey, values in getattr(other, key).items():
+                merge_dicts(getattr(self, key)[subkey], values)
+
+        return self
+
+    def write(self, delimiter=',', quoting=QUOTE_MINIMAL, output_format='csv'):
+        '''
+        Write output files and print analysis overview,
+        as CSV or columnar files (see lib_output).
+        '''
+        # empty lists
+        hashtags_by_period = []
+        top_dates = []
+        top_tweets = []
+        top_users = []
+        top_words = []
+        top_words_capitalized = []
+        words_by_period = []
+
+        # zero int counters
+        int_global_dialogue = 0
+        int_global_users_dialogue = 0
+
+        # empty int dictionaries
+        dict_int_influence = defaultdict(int)
+
+        # shortcuts
+        set_dates = self.set_dates
+        dict_int_type = self.dict_int_type
+        dict_int_total = self.dict_int_total
+        dicts_int_dates = self.dicts_int_dates
+        dicts_int_receiving = self.dicts_int_receiving
+        dicts_int_sending = self.dicts_int_sending
+        dicts_set_receiving = self.dicts_set_receiving
+        dicts_set_sending = self.dicts_set_sending
+
+        int_total_lines = self.int_total_lines
+        int_valid_lines = int_total_lines - self.int_corrupted_lines - self.int_duplicate_lines - 1
+        int_valid_lines = int_valid_lines - sum(self.dict_int_skipped.values())
+
+        print('Read', int_total_lines, 'total lines.')
+        print(self.int_corrupted_lines, 'corrupted lines.') if self.int_corrupted_lines > 0 else None
+        for reason, int_lines in self.dict_int_skipped.items():
+            print(int_lines, reason, 'lines.')
+        print(self.int_duplicate_lines, 'duplicate tweets.') if self.int_duplicate_lines > 0 else None
+        print(int_valid_lines, 'valid lines.') if int_valid_lines > 0 else None
+
+        if int_valid_lines == 0:
+            print('Error: not enough data to parse.')
+            return
+
+        # write users as first seen
+        if output_format == 'csv':
+            with open_output('users.csv') as users_file:
+                users_writer = writer(users_file, delimiter=delimiter, quoting=quoting)
+                users_writer.writerow(TWITTER_USERS_HEADER)
+                users_writer.writerows(self.users)
+        else: write_table('users.csv', self.users, TWITTER_USERS_HEADER, output_format)
+
+        # analyze data
+        int_tweets = len(self.set_tweet_ids)
+        int_original = dict_int_type['tweet']
+        int_quotes = dict_int_type['quote']
+        int_retweets = dict_int_type['retweet']
+        int_replies = dict_int_type['reply']
+        int_mentions = sum(dicts_int_sending['mention'].values())
+        int_interactions = int_retweets + int_replies + int_mentions
+        int_country = len(self.dict_int_countries)
+        int_emojis = len(self.dict_int_emojis)
+        int_hashtags = len(self.dict_int_hashtags)
+        int_lang = len(self.dict_int_lang)
+        int_media = len(self.dict_int_media)
+        int_places = len(self.dict_int_places)
+        int_sources = len(self.dict_int_source)
+        int_urls = len(self.dict_int_urls)
+        int_words = len(self.words)
+        int_geocoded = dict_int_total['in_geonames']
+        int_tweets_with_emoji = dict_int_total['emoji']
+        int_tweets_with_geocode = dict_int_total['geocode'] + int_geocoded
+        int_tweets_with_hashtag = dict_int_total['hashtag']
+        int_tweets_with_media = dict_int_total['media_url']
+        int_tweets_with_mention = dict_int_total['mention']
+        int_tweets_with_place = dict_int_total['place']
+        int_tweets_with_url = dict_int_total['url']
+        int_users = len(self.set_users_all)
+        int_users_op = self.users_stats.count('original')
+        int_users_tweeting = self.users_stats.count('tweets')
+        int_users_retweeting = len(dicts_set_sending['retweet'])
+        int_users_retweeted = len(dicts_set_receiving['retweet'])
+        int_users_quoting = len(dicts_set_sending['quote'])
+        int_users_quoted = len(dicts_set_receiving['quote'])
+        int_users_replying = len(dicts_set_sending['reply'])
+        int_users_replied = len(dicts_set_receiving['reply'])
+        int_users_mentioning = len(dicts_set_sending['mention'])
+        int_users_mentioned = len(dicts_set_receiving['mention'])
+        int_users_senders = len(dicts_set_sending['all'])
+        int_users_receivers = len(dicts_set_receiving['all'])
+        dicts_int_dates['user'] = dict_of_int_from_dict_of_lists(self.dict_set_tweets_date)
+
+        # get a timeline of hashtags
+        for hashtag in get_N_first(self.dict_int_hashtags, 50):
+            line = [hashtag]
+            for date in sorted(set_dates):
+                line.append(self.dicts_int_hashtags_by_date[date][hashtag])
+            hashtags_by_period.append(line)
+
+        # get a timeline of words
+        for word in self.words.top('times', 50):
+            line = [word]
+            for date in sorted(set_dates):
+                line.append(self.dicts_int_words_by_date[date][word])
+            words_by_period.append(line)
+
+        # get top dates
+        for date in set_dates:
+            original = dicts_int_dates['tweet'][date]
+            retweets = dicts_int_dates['retweet'][date]
+            replies = dicts_int_dates['reply'][date]
+            quotes = dicts_int_dates['quote'][date]
+            tweets = original + retweets + replies
+            usernames = dicts_int_dates['user'][date]
+            mentions = dicts_int_dates['mention'][date]
+            hashtags = dicts_int_dates['hashtag'][date]
+            sentiment = dicts_int_dates['sentiment'][date]
+            top_dates.append([date, usernames, tweets, original, retweets, replies, mentions, hashtags, sentiment])
+
+        # get top users
+        for user in self.set_users_all:
+            # main tweet metadata
+            tweets = self.users_stats.get(user, 'tweets')
+            rt_count = self.users_stats.get(user, 'retweets')
+            favorite_count = self.users_stats.get(user, 'favorites')
+            # unique tweet interactions
+            qts_in = dicts_int_receiving['quote'][user] if user in dicts_int_receiving['quote'] else 0
+            qts_out = dicts_int_sending['quote'][user] if user in dicts_int_sending['quote'] else 0
+            rts_in = dicts_int_receiving['retweet'][user] if user in dicts_int_receiving['retweet'] else 0
+            rts_out = dicts_int_sending['retweet'][user] if user in dicts_int_sending['retweet'] else 0
+            ats_in = dicts_int_receiving['reply'][user] if user in dicts_int_receiving['reply'] else 0
+            ats_out = dicts_int_sending['reply'][user] if user in dicts_int_sending['reply'] else 0
+            mts_in = dicts_int_receiving['mention'][user] if user in dicts_int_receiving['mention'] else 0
+            mts_out = dicts_int_sending['mention'][user] if user in dicts_int_sending['mention'] else 0
+            # unique user interactions
+            qts_users_in = len(dicts_set_receiving['quote'][user]) if user in dicts_set_receiving['quote'] else 0
+            qts_users_out = len(dicts_set_sending['quote'][user]) if user in dicts_set_sending['quote'] else 0
+            rts_users_in = len(dicts_set_receiving['retweet'][user]) if user in dicts_set_receiving['retweet'] else 0
+            rts_users_out = len(dicts_set_sending['retweet'][user]) if user in dicts_set_sending['retweet'] else 0
+            ats_users_in = len(dicts_set_receiving['reply'][user]) if user in dicts_set_receiving['reply'] else 0
+            ats_users_out = len(dicts_set_sending['reply'][user]) if user in dicts_set_sending['reply'] else 0
+            mts_users_in = len(dicts_set_receiving['mention'][user]) if user in dicts_set_receiving['mention'] else 0
+            mts_users_out = len(dicts_set_sending['mention'][user]) if user in dicts_set_sending['mention'] else 0
+            # total user/tweet unique interactions
+            total_users_in = len(dicts_set_receiving['all'][user]) if user in dicts_set_receiving['all'] else 0
+            total_users_out = len(dicts_set_sending['all'][user]) if user in dicts_set_sending['all'] else 0
+            total_users = len(set(list(dicts_set_receiving['all'][user]) + list(dicts_set_sending['all'][user])))
+            total_in = (rts_in + ats_in + mts_in)
+            total_out = (rts_out + ats_out + mts_out)
+            total = (total_in + total_out)
+            # influence index (user impact)
+            if tweets > 0:
+                influence = (rts_in/tweets)
+                dict_int_influence['@'+user] = influence
+                influence = str_from_num(influence)
+            else: influence = None
+            # dialogue index (@-message intensity)
+            if (ats_in+ats_out) > 0:
+                dialogue = (ats_out/(ats_in+ats_out))
+                int_global_dialogue += dialogue
+                dialogue = str_from_num(dialogue)
+                int_global_users_dialogue += 1
+            else: dialogue = None
+            # plurality index (interaction uniqueness)
+            plurality = str_from_num(total_users/total) if total > 0 else None
+            # add user activity to set
+            top_users.append([user, tweets, rt_count, favorite_count,
+                              influence, dialogue, plurality,
+                              rts_in, rts_users_in, rts_out, rts_users_out,
+                              ats_in, ats_users_in, ats_out, ats_users_out,
+                              mts_in, mts_users_in, mts_out, mts_users_out,
+                              total_in, total_users_in, total_out, total_users_out,
+                              total, total_users])
+
+        # get top retweeted tweets
+        top_tweet_ids = get_N_first(self.dict_int_tweets, 5000)
+        top_tweets_hashtags = str_from_lists(self.dict_tweets[tweet_id]['hashtags'] for tweet_id in top_tweet_ids)
+
+        for tweet_id, hashtags in zip(top_tweet_ids, top_tweets_hashtags):
+            tweet = self.dict_tweets[tweet_id]
+            txt_count = self.dict_int_text[tweet['text']] # <== tweet_text counter
+            top_tweets.append([tweet['text'], tweet['from_user'], tweet_id, hashtags,
+                               tweet['rt_count'], tweet['favorite_count'], txt_count, tweet['type'],
+                               tweet['lang'], tweet['place'], tweet['country'], tweet['source'],
+                               tweet['media'], tweet['created_at'], tweet['url']])
+
+        # get top words
+        for word in self.words.top('times', 250):
+            times = self.words.get(word, 'times')
+            likes = self.words.get(word, 'favorited')
+            retweets = self.words.get(word, 'retweeted')
+            top_words.append([word, times, likes, retweets])
+
+        # get top capitalized words
+        words_capitalized = self.words_capitalized.top('times', 250)
+        for word, gender in zip(words_capitalized, gender_identify_list(words_capitalized)):
+            times = self.words_capitalized.get(word, 'times')
+            likes = self.words_capitalized.get(word, 'favorited')
+            retweets = self.words_capitalized.get(word, 'retweeted')
+            top_words_capitalized.append([word, times, gender, likes, retweets])
+
+        header_edges=['type VARCHAR', 'tweet_id VARCHAR', 'text VARCHAR',
+            'favorite_count INT', 'rt_count INT', 'time INT']
+        header_nodes=["user_followers INT", "user_following INT"]
+        header_weight=['weight DOUBLE']
+
+        users_nodes = self.users_nodes
+
+        # add user retweets before engagement
+        if self.adapter.nodes_engagement:
+            header_nodes += ["user_retweets INT", "user_engagement INT"]
+            users_nodes = [[name, followers, following, self.users_stats.get(name, 'retweets'), engagement]
+                           for name, followers, following, engagement in users_nodes]
+
+        for key in self.dict_networks.keys():
+            write_gdf(
+                ('network_' + key + '.gdf'),
+                self.dict_networks[key],
+                nodes=users_nodes,
+                header_nodes=header_nodes,
+                header_edges=header_weight if self.weighted_networks else\
+                             header_edges if all(i not in key for i in ['hashtags', 'URLs']) else [],
+                directed=True if key != 'hashtags' else False, output_format=output_format)
+
+        # reverse geocode points to their nearest place
+        if self.geonames:
+            points = [location for location in self.locations if location[2] == 'point']
+            for location, place in zip(points, self.geonames.nearest([location[:2] for location in points])):
+                if place:
+                    location[2] = 'Point (ID ' + place[2] + ')'
+
+        write_set('locations.csv', self.locations,
+            ['latitude', 'longitude', 'geo_type', 'place', 'country', 'country_code', 'lang', 'time', 'user', 'text', 'image_url', 'url'], output_format=output_format)
+
+        write_set('top_dates.csv', top_dates,
+            ['date', 'users', 'tweets', 'original', 'retweets', 'replies', 'mentions', 'hashtags', 'sentiment'], output_format=output_format)
+
+        write_set('top_tweets.csv', top_tweets,
+            ['text', 'from_user', 'tweet_id', 'hashtags', 'rt_count', 'favorite_count', 'tweet_count', 'type', 'lang', 'place', 'country', 'source', 'media', 'date', 'url'], output_format=output_format)
+
+        write_set('top_users.csv', top_users,
+            ['from_user',  'tweets_published', 'retweet_count', 'favorite_count',
+             'influence', 'dialogue_%', 'plurality_%',
+             'retweets_in', 'retweets_users_in', 'retweets_out', 'retweets_users_out',
+             'replies_in', 'replies_users_in', 'replies_out', 'replies_users_out',
+             'mentions_in', 'mentions_users_in', 'mentions_out', 'mentions_users_out',
+             'total_in', 'total_users_in', 'total_out', 'total_users_out',
+             'total', 'total_users'], output_format=output_format)
+
+        write_set('top_hashtags_by_period.csv', hashtags_by_period,
+            ['hashtag']+list(sorted(set_dates)), output_format=output_format)
+
+        write_set('top_words_by_period.csv', words_by_period,
+            ['word']+list(sorted(set_dates)), output_format=output_format)
+
+        write_set('top_words.csv', top_words,
+            ['word', 'times_mentioned', 'likes', 'retweets'], output_format=output_format)
+
+        write_set('top_words_capitalized.csv', top_words_capitalized,
+            ['word', 'times_mentioned', 'name_gender', 'likes', 'retweets'], output_format=output_format)
+
+        write_values('top_countries.csv', self.dict_int_countries, ['country', 'tweets', 'tweets_%'], pct=True, output_format=output_format)
+        write_values('top_emojis.UTF16.csv', self.dict_int_emojis, ['emoji', 'times_tweeted'], encoding='utf16', output_format=output_format)
+        write_values('top_favorites.csv', self.dict_int_favorites, ['tweet', 'favorite_count'], output_format=output_format)
+        write_values('top_hashtags.csv', self.dict_int_hashtags, ['hashtag', 'times_mentioned'], output_format=output_format)
+        write_values('top_lang.csv', self.dict_int_lang, ['lang', 'tweets', 'tweets_%'], pct=True, output_format=output_format)
+        write_values('top_media.csv', self.dict_int_media, ['media_url', 'times_tweeted'], output_format=output_format)
+        write_values('top_places.csv', self.dict_int_places, ['place', 'tweets', 'tweets_%'], pct=True, output_format=output_format)
+        write_values('top_quotes.csv', self.dict_int_quotes, ['tweet', 'times_quoted'], output_format=output_format)
+        write_values('top_replies.csv', self.dict_int_replies, ['tweet', 'reply_count'], output_format=output_format)
+        write_values('top_retweets.csv', self.dict_int_retweets, ['tweet', 'rt_count'], output_format=output_format)
+        write_values('top_sentiments.UTF16.csv', self.dict_int_sentiment, ['tweet', 'sent_value'], encoding='utf16', output_format=output_format)
+        write_values('top_source.csv', self.dict_int_source, ['source', 'tweets', 'tweets_%'], pct=True, output_format=output_format)
+        write_values('top_text.csv', self.dict_int_text, ['tweet', 'txt_count'], output_format=output_format)
+        write_values('top_type.csv', self.dict_int_type, ['type', 'tweets', 'tweets_%'], pct=True, output_format=output_format)
+        write_values('top_URLs.csv', self.dict_int_urls, ['url', 'times_tweeted'], output_format=output_format)
+
+        write_values('top_hashtags_by_users.csv', self.dict_set_hashtags, ['hashtag', 'unique_users'],
+            value_format_function=lambda t: len(t), output_format=output_format)
+        write_values('top_media_by_users.csv', self.dict_set_media, ['media_url', 'unique_users'],
+            value_format_function=lambda t: len(t), output_format=output_format)
+        write_values('top_urls_by_users.csv', self.dict_set_urls, ['url', 'unique_users'],
+            value_format_function=lambda t: len(t), output_format=output_format)
+
+        if self.adapter.top_tweets_by_date:
+            self.write_top_tweets_by_date(output_format)
+
+        write_wordcloud('wordcloud_words.txt', self.words.to_dict('times'))
+        write_wordcloud('wordcloud_hashtags.txt', self.dict_int_hashtags)
+
+        # get time range
+        min_date = datetime_from_timestamp(self.min_timestamp, utc=True)
+        max_date = datetime_from_timestamp(self.max_timestamp, utc=True)
+        time_diff, time_string, seconds = get_time_diff(max_date, min_date)
+
+        # get frequency
+        frequency_tweet = int_tweets/time_diff if time_diff > 0 else 0
+        frequency_favorite = self.int_global_favorites/time_diff if time_diff > 0 else 0
+        frequency_retweet = self.int_global_retweets/time_diff if time_diff > 0 else 0
+
+        # get global values
+        global_dialogue = int_global_dialogue/int_global_users_dialogue if int_global_users_dialogue > 0 else 'None'
+        global_sentiment = self.int_global_sentiment/int_tweets_with_emoji if int_tweets_with_emoji > 0 else 'None'
+
+        # get top stats
+        top_country = get_N_first(self.dict_int_countries, 1)[0] if self.dict_int_countries else 'None'
+        top_favorite = get_N_first(self.dict_int_favorites, 1) if self.dict_int_favorites else 'None'
+        top_hashtags = get_N_first(self.dict_int_hashtags, 5) if self.dict_int_hashtags else 'None'
+        top_lang = get_N_first(self.dict_int_lang, 1)[0] if self.dict_int_lang else 'None'
+        top_source = get_N_first(self.dict_int_source, 1)[0] if self.dict_int_source else 'None'
+        top_url = get_N_first(self.dict_int_urls, 1) if self.dict_int_urls else 'None'
+        top_retweet = get_N_first(self.dict_int_retweets, 1) if self.dict_int_retweets else 'None'
+        top_usernames = get_N_first(dict_int_influence, 5) if dict_int_influence else 'None'
+        top_words =  self.words.top('times', 5) if self.words else 'None'
+
+        # convert to strings
+        min_date = datetime_to_str(min_date, '%a %b %d %H:%M:%S %Y UTC')
+        max_date = datetime_to_str(max_date, '%a %b %d %H:%M:%S %Y UTC')
+        time_diff = str_from_num(time_diff) + ' ' + time_string
+        frequency_tweet = str_from_num(frequency_tweet) + ' tweets/' + time_string.rstrip('s')
+        frequency_favorite = str_from_num(frequency_favorite) + '/tweet'
+        frequency_retweet = str_from_num(frequency_retweet) + '/tweet'
+        global_dialogue = str_from_num(global_dialogue)
+        global_sentiment = str_from_num(global_sentiment)
+        top_country = str_from_list(top_country)
+        top_favorite = str_from_list(top_favorite)
+        top_hashtags = str_from_list(top_hashtags)
+        top_lang = str_from_list(top_lang)
+        top_source = str_from_list(top_source)
+        top_url = str_from_list(top_url)
+        top_retweet = str_from_list(top_retweet)
+        top_usernames = str_from_list(top_usernames)
+        top_words = str_from_list(top_words)
+
+        # remove special characters from tweets text
+        top_favorite = '"'+unencode(remove_latin_accents(top_favorite))+'"' if top_favorite else 'None'
+        top_retweet = '"'+unencode(remove_latin_accents(top_retweet))+'"' if top_retweet else 'None'
+
+        # analysis overview
+        print('\nTweets:', int_tweets, 'from', int_users_tweeting, 'users.'+
+              '\nOriginal:', int_original, 'from', int_users_op, 'users.'+
+              '\nUsers:', int_users, 'senders and receivers.'+
+              '\n\nCountries:', int_country, '(top:', top_country + ').'+
+              '\nDialogue:', global_dialogue, 'global.'+
+              '\nEmojis:', int_emojis, 'from', int_tweets_with_emoji, 'tweets.'+
+              '\nFavorited:', self.int_global_favorites, '(' + frequency_favorite + ').'+
+              '\nGeocodes:', int_tweets_with_geocode, '(' + str(int_geocoded), 'from GeoNames).'+
+              '\nHashtags:', int_hashtags, 'from', int_tweets_with_hashtag, 'tweets.'+
+              '\nLanguages:', int_lang, '(top:', top_lang.upper() + ').'+
+              '\nMedia:', int_media, 'from', int_tweets_with_media, 'tweets.'+
+              '\nPlaces:', int_places, 'from', int_tweets_with_place, 'tweets.'+
+              '\nRetweeted:', self.int_global_retweets, '(' + frequency_retweet + ').'+
+              '\nSentiment:', global_sentiment, 'global.'+
+              '\nSources:', int_sources, '(top:', top_source + ').'+
+              '\nURLs:', int_urls, 'from', int_tweets_with_url, 'tweets.'+
+              '\nWords:', int_words, 'approximately.'+
+              '\n\nRetweets:', int_retweets, 'from', int_users_retweeting, 'senders to', int_users_retweeted, 'receivers.'+
+              '\nQuotes:', int_quotes, 'from', int_users_quoting, 'senders to', int_users_quoted, 'receivers.'+
+              '\n@-messages:', int_replies, 'from', int_users_replying, 'senders to', int_users_replied, 'receivers.'+
+              '\nMentions:', int_mentions, 'from', int_users_mentioning, 'senders to', int_users_mentioned, 'receivers.'+
+              '\nInteractions:', int_interactions, 'from', int_users_senders, 'senders to', int_users_receivers, 'receivers.'+
+              '\n\nTop words:', top_words+'.'+
+              '\nTop hashtags:', top_hashtags+'.'+
+              '\nTop users:', top_usernames+'.'+
+              '\nTop URL:', top_url+'.'+
+              '\nTop retweet:', top_retweet+'.'+
+              '\nTop favorite:', top_favorite+'.'+
+              '\n\nTime span:', time_diff+'.'+
+              '\nFrequency:', frequency_tweet+'.'+
+              '\nOldest ID:', str(self.min_id)+'.'+
+              '\nNewest ID:', str(self.max_id)+'.'+
+              '\nSince:', min_date+'.'+
+              '\nUntil:', max_date+'.')
+
+    def write_top_tweets_by_date(self, output_format='csv'):
+        '''
+        Write most retweeted tweets with replies for each day.
+        '''
+        top_tweets_by_date = []
+        n = self.adapter.columns['retweets']+1
+
+        for date, tweets in self.top_tweets_by_date.items():
+            for rt_count, order, tweet_id, line in sorted(tweets, reverse=True):
+                replies_url = f"https://twitter.com/search?q=conversation_id%3A{tweet_id}%20filter%3Areplies&src=typed_query&f=live"
+                top_tweets_by_date.append([date] + list(line) + [replies_url])
+
+        # sort by date and retweets
+        top_tweets_by_date = sorted(top_tweets_by_date, key=lambda x: (x[0], int(x[n] or 0)), reverse=True)
+        write_set('top_tweets_by_date.csv', top_tweets_by_date,
+            header=['Data'] + self.adapter.header + ['Replies URL'], output_format=output_format)
+
+def accumulate_tweets(input_name, adapter, delimiter=',', quoting=QUOTE_MINIMAL, workers=1, **kwargs):
+    '''
+    Read tweets file with the given adapter, in shards
+    if more than one worker, and return its accumulator.
+    '''
+    kwargs['adapter'] = adapter
+    kwargs['geonames'] = load_geonames(kwargs.get('geonames'))
+
+    if workers and int(workers) > 1:
+        shards = get_file_shards(input_name, int(workers), quotechar=None if quoting == QUOTE_NONE else '"')
+        print('Split file in', len(shards), 'shards.')
+        tasks = [(input_name, start, end, delimiter, quoting, dict(kwargs)) for start, end in shards]
+        with Pool(int(workers)) as pool:
+            # skip tweets already read in previous shards
+            set_tweet_ids = set()
+            for task, ids in zip(tasks, pool.imap(read_shard_ids, tasks)):
+                task[-1]['skip_ids'] = ids & set_tweet_ids
+                set_tweet_ids |= ids
+            del set_tweet_ids
+            # parse shards in parallel and merge them in reading order
+            accumulator = reduce(TweetAccumulator.merge,
+                pool.imap(parse_shard, tasks),
+                TweetAccumulator(**kwargs))
+        accumulator.int_total_lines += 1 # header
+        return accumulator
+
+    accumulator = TweetAccumulator(**kwargs)
+
+    # start file reading
+    with open(input_name, 'rt', encoding='utf8') as input_file:
+        file_reader = reader(input_file, delimiter=delimiter, quoting=quoting)
+        next(file_reader) # skips the first line
+
+        # iterate through chunks of lines
+        for lines in read_chunks(file_reader):
+            accumulator.add_lines(lines)
+
+    accumulator.int_total_lines = file_reader.line_num
+    return accumulator
+
+def get_tweets_adapter(input_name, delimiter=',', quoting=QUOTE_MINIMAL):
+    '''
+    Return adapter matching the dataset format.
+    '''
+    columns = get_file_header(input_name)
+
+    # check if dataset matches a Gephi edges network
+    if all(x in columns for x in ['source', 'target']):
+        print('Gephi edges network data found.')
+        return GephiAdapter(input_name, delimiter, quoting)
+
+    # check if dataset matches latest script version
+    elif list(columns.keys()) == TWEETS_HEADER:
+        print('Up-to-date tweets dataset found.')
+
+    # check if dataset matches YourTwapperKeeper/legacy format
+    elif any(i not in columns.keys() for i in ['type', 'media_url', 'place', 'geo_type'])\
+    and all(i in columns.keys() for i in YTK_HEADER):
+        print('YourTwapperKeeper dataset found.')
+        return YourTwapperKeeperAdapter(input_name, delimiter, quoting)
+
+    return TweetsAdapter(input_name, delimiter, quoting)
+
+def parse_shard(args):
+    '''
+    Parse a byte range of a tweets file in a worker process
+    and return its accumulator to be merged.
+    '''
+    input_name, start, end, delimiter, quoting, kwargs = args
+    accumulator = TweetAccumulator(**kwargs)
+    file_reader = reader(read_file_shard(input_name, start, end), delimiter=delimiter, quoting=quoting)
+    for lines in read_chunks(file_reader):
+        accumulator.add_lines(lines)
+    accumulator.int_total_lines = file_reader.line_num
+    return accumulator
+
+def read_shard_ids(args):
+    '''
+    Return the set of tweet IDs in a byte range of a tweets file,
+    so tweets repeated from previous shards can be skipped.
+    '''
+    input_name, start, end, delimiter, quoting, kwargs = args
+    adapter = kwargs['adapter']
+    set_tweet_ids = set()
+    for line in reader(read_file_shard(input_name, start, end), delimiter=delimiter, quoting=quoting):
+        line = adapter.fix_line(line)
+        if len(line) == len(adapter.header) and line != adapter.header:
+            try: # filters are checked before duplicates, and a repeated
+                # tweet is filtered the same way; IDs are only checked by
+                # the next shards, not counted, so language detection is
+                # left for the batched parsing pass
+                set_tweet_ids.add(adapter.get_id(read_line(line, adapter.columns)))
+            except: pass
+    return set_tweet_ids
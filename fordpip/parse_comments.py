@@ -4,15 +4,20 @@ import re
 import string
 import warnings
 from argparse import ArgumentParser
-from collections import defaultdict
+from collections import Counter, defaultdict
+from contextlib import nullcontext
 from datetime import datetime
+from functools import partial
+from heapq import nsmallest
 from itertools import combinations
+from multiprocessing import Pool
 from os import listdir, mkdir
 from os.path import isdir, splitext
 from typing import Union
 
 import networkx as nx
 import nltk
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.io as pio
@@ -22,6 +27,11 @@ try:
 except:
     from lib_stopwords import STOPWORDS
 
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
 pio.templates.default = "none"
 
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -32,15 +42,19 @@ COLUMN_COMMENTS = "Comments"
 COLUMN_LIKES = "Likes"
 COLUMN_TEXT = ["Comment", "Caption"]
 
+CAP_VOCABULARY = False
+CHUNKSIZE = None
 ENGINE = "c"
 EXTENSIONS = [".csv", ".xls", ".xlsx"]
 GRAPH_FORMAT = "gml"
 MAX_WORD_NODES = 100
 N_GRAMS = 2
+N_JOBS = 1
 N_REPLIES = 10
 N_THREADS = 10
 NODE_ZERO = "0"
 OUTPUT_FORMAT = "csv"
+COLUMNAR_FORMATS = ["parquet", "arrow"]
 OUTPUT_NAME = "RESULTS"
 QUICK_PARSE = False
 REMOVE_SELFLOOPS = True
@@ -65,6 +79,17 @@ CHARACTER_REPLACEMENTS = str.maketrans('', '', ''.join(
 
 IGNORE_STARTS_WITH = ['http', 'www', 'kkk']
 
+EMOJI_REGEX = re\
+    .compile("["
+        u"\U0001F600-\U0001F64F"  # emoticons
+        u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+        u"\U0001F680-\U0001F6FF"  # transport & map symbols
+        u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+        u"\U00002702-\U000027B0"  # extra (1)
+        u"\U000024C2-\U0001F251"  # extra (2)
+        u"\U0000200B-\U0000200D"  # zero width
+        "]+", flags=re.UNICODE)
+
 class ParseComments():
 
     def __init__(self, engine=ENGINE):
@@ -78,12 +103,15 @@ class ParseComments():
         column_date=COLUMN_DATE,
         column_likes=COLUMN_LIKES,
         column_text=COLUMN_TEXT,
+        cap_vocabulary=CAP_VOCABULARY,
+        chunksize=CHUNKSIZE,
         datetime_source=DATETIME_SOURCE,
         datetime_target=DATETIME_TARGET,
         extensions=EXTENSIONS,
         graph_format=GRAPH_FORMAT,
         max_word_nodes=MAX_WORD_NODES,
         n_grams=N_GRAMS,
+        n_jobs=N_JOBS,
         n_replies=N_REPLIES,
         n_threads=N_THREADS,
         node_zero=NODE_ZERO,
@@ -94,250 +122,108 @@ class ParseComments():
         skiprows=SKIPROWS,
         stop_words=STOPWORDS,
     ) -> None:
-        tokenizer = Tokenizer(stop_words=stop_words)
-        stop_words = stop_words = ["photo"]
-
         threads = list()
         dates = defaultdict(int)
         hours = defaultdict(int)
         profiles = defaultdict(lambda:defaultdict(int))
         times = defaultdict(int)
         statistics = defaultdict(lambda:defaultdict(str))
+        hashtags = Counter()
+        ngrams = Counter()
+        words = Counter()
 
-        G_ngrams = nx.Graph()
-        G_profiles = nx.DiGraph()
-        G_words = nx.Graph()
-
-        for f in self.__list_files(input_name, extensions):
+        G_ngrams = CoOccurrence(remove_selfloops=remove_selfloops)
+        G_profiles = EdgeWeights(directed=True)
+        G_words = CoOccurrence(remove_selfloops=remove_selfloops)
 
-            if skiprows is None:
-                skiprows = 0
-                sample = self._load_comments(f, nrows=10, skiprows=0)
-                if "Unnamed" in sample.columns[-1]:
-                    skiprows = 5
-                    sample = self._load_comments(f, nrows=10, skiprows=5)
-                    if "Unnamed" in sample.columns[-1]:
-                        skiprows = 6
+        # count pairs only after reading the top tokens of all files
+        cap_vocabulary = bool(cap_vocabulary and max_word_nodes and not quick_parse)
 
-            df = self._load_comments(f, skiprows=skiprows)
-            print(f"Loaded {df.shape} objects from '{f}' (rows skipped: {skiprows}).")
+        files = self.__list_files(input_name, extensions)
 
-            for column in column_date:
-                if column in df.columns:
-                    column_date = column
-                    break
-
-            for column in column_name:
-                if column in df.columns:
-                    column_name = column
-                    break
-
-            for column in column_text:
-                if column in df.columns:
-                    column_text = column
-                    break
-
-            print(f"Processing rows...")
-            text = df\
-                .loc[:, column_text]\
-                .apply(str)\
-                .apply(lambda x: x.split("\n"))\
-                .apply(lambda x: x if x else None)\
-                .dropna()\
-                .explode()
-
-            print(f"Processing hashtags...")
-            hashtags = text\
-                .apply(lambda x: self.__find_hashtags(x))\
-                .explode()\
-                .value_counts()
-
-            print(f"Processing tokens...")
-            tokens = text\
-                .apply(lambda x: tokenizer.tokenize(x) or None)\
-                .dropna()
-
-            if not quick_parse:
-                print(f"Generating word graph...")
-                self.__add_edges_to_graph(
-                    G_words,
-                    edges=pd.Series([list(combinations(_, 2)) for _ in tokens]).explode().dropna(),
-                    remove_selfloops=remove_selfloops,
-                )
-
-            words = tokens\
-                .explode()\
-                .value_counts()
-
-            print(f"Processing n-grams...")
-            ngrams = tokens\
-                .apply(lambda x: tokenizer.ngrams(x, n=n_grams) or None)\
-                .dropna()\
-                .apply(lambda x: [" ".join(_) for _ in x])
+        if skiprows is None and files:
+            skiprows = 0
+            sample = self._load_comments(files[0], nrows=10, skiprows=0)
+            if "Unnamed" in sample.columns[-1]:
+                skiprows = 5
+                sample = self._load_comments(files[0], nrows=10, skiprows=5)
+                if "Unnamed" in sample.columns[-1]:
+                    skiprows = 6
+
+        parse_file = partial(
+            self._parse_file,
+            column_name=column_name,
+            column_comments=column_comments,
+            column_date=column_date,
+            column_likes=column_likes,
+            column_text=column_text,
+            chunksize=chunksize,
+            datetime_source=datetime_source,
+            datetime_target=datetime_target,
+            n_grams=n_grams,
+            n_replies=n_replies,
+            n_threads=n_threads,
+            node_zero=node_zero,
+            remove_selfloops=remove_selfloops,
+            quick_parse=quick_parse or cap_vocabulary,
+            skiprows=skiprows,
+            stop_words=stop_words,
+        )
 
-            if not quick_parse:
-                print(f"Generating n-gram graph...")
-                self.__add_edges_to_graph(
-                    G_ngrams,
-                    edges=pd.Series([list(combinations(_, 2)) for _ in ngrams]).explode().dropna(),
+        # parse files in parallel and merge them in order
+        with (Pool(n_jobs) if n_jobs > 1 and len(files) > 1 else nullcontext()) as pool:
+            for f, result in zip(files, pool.imap(parse_file, files) if pool else map(parse_file, files)):
+
+                for counter, values in [
+                    (dates, result["dates"]),
+                    (hashtags, result["hashtags"]),
+                    (hours, result["hours"]),
+                    (ngrams, result["ngrams"]),
+                    (times, result["times"]),
+                    (words, result["words"]),
+                ]:
+                    for k, v in values.items():
+                        counter[k] += v
+
+                for key, values in result["profiles"].items():
+                    for k, v in values.items():
+                        profiles[key][k] += v
+
+                statistics[f].update(result["statistics"])
+                threads.extend(result["threads"])
+
+                G_ngrams.merge(result["G_ngrams"])
+                G_profiles.merge(result["G_profiles"])
+                G_words.merge(result["G_words"])
+
+            if cap_vocabulary:
+                # ties sorted by token, the same in any order of reading
+                G_ngrams = CoOccurrence(
+                    [k for k, v in nsmallest(max_word_nodes, ngrams.items(), key=lambda x: (-x[1], x[0]))],
+                    remove_selfloops)
+                G_words = CoOccurrence(
+                    [k for k, v in nsmallest(max_word_nodes, words.items(), key=lambda x: (-x[1], x[0]))],
+                    remove_selfloops)
+
+                count_pairs = partial(
+                    self._count_pairs,
+                    vocabulary_ngrams=G_ngrams.nodes,
+                    vocabulary_words=G_words.nodes,
+                    column_text=column_text,
+                    chunksize=chunksize,
+                    n_grams=n_grams,
                     remove_selfloops=remove_selfloops,
+                    skiprows=skiprows,
+                    stop_words=stop_words,
                 )
 
-            ngrams = ngrams\
-                .explode()\
-                .value_counts()
-
-            print(f"Processing threads...")
-            try:
-                thread_profiles = {
-                    int(k): y
-                    for k, x, y in zip(
-                        df.iloc[:, 0],
-                        df.iloc[:, 1],
-                        df.loc[:, column_name],
-                    )
-                    if type(x) != str
-                }
-            except:
-                column_name = column_name.split()[0]
-
-            thread_ids = pd.Series({
-                k: str(y if type(y) == str else x)
-                for k, x, y in zip(
-                    df.index,
-                    df.iloc[:, 0],
-                    df.iloc[:, 1],
-                )
-            })
-
-            datetimes = df\
-                .loc[:, column_date]\
-                .apply(lambda x: (datetime.strptime(x, datetime_source) if type(x) == str else x).strftime(datetime_target))
-
-            for k, v in datetimes.apply(lambda x: x[:10]).value_counts().items():
-                dates[k] += v
-            for k, v in datetimes.apply(lambda x: f"{x[:14]}00:00").value_counts().items():
-                hours[k] += v
-            for k, v in datetimes.apply(lambda x: f"{x[:18]}0").value_counts().items():
-                times[k] += v
-
-            replies = df\
-                .loc[thread_ids.apply(lambda x: x if "-" in x else None).dropna().index]
+                for result in (pool.imap(count_pairs, files) if pool else map(count_pairs, files)):
+                    G_ngrams.merge(result["G_ngrams"])
+                    G_words.merge(result["G_words"])
 
-            print(f"Generating profile graph...")
-
-            self.__add_edges_to_graph(
-                G_profiles,
-                edges=[
-                    [s, node_zero]
-                    for s in
-                        df.loc[thread_ids.apply(lambda x: x if "-" not in x else None).dropna().index, column_name]
-                ],
-                remove_selfloops=remove_selfloops
-            )
-
-            self.__add_edges_to_graph(
-                G_profiles,
-                edges=[
-                    [s, thread_profiles[int(t)]]
-                    for s, t in zip(
-                        replies.loc[:, column_name],
-                        replies.iloc[:, 1].apply(lambda x: x.split("-")[0]))
-                    ],
-                remove_selfloops=remove_selfloops
-            )
-
-            print(f"Generating statistics...")
-
-            for i, thread in enumerate(
-                replies
-                .iloc[:, 1]
-                .apply(lambda x: float(x.split("-")[0]))
-                .value_counts()
-                .head(n_threads)
-                .items()
-            ):
-                loc = df.loc[df[df[df.columns[0]] == thread[0]].index[0]]
-                threads.append({
-                    "#": f"{i+1}",
-                    "profile": loc[column_name],
-                    "text": loc[column_text],
-                    "likes": loc[column_likes],
-                    "comments": loc[column_comments] if column_comments in df.columns else "",
-                    "replies": thread[1],
-                    "source": f
-                })
-
-                for j, reply in enumerate(
-                    replies[replies.iloc[:, 1].apply(lambda x: True if float(x.split("-")[0]) == thread[0] else False)]
-                    .sort_values(column_likes, ascending=False).index[:n_replies]
-                ):
-                    loc = replies.loc[reply]
-                    threads.append({
-                        "#": f"{i+1}-{j+1}",
-                        "profile": loc[column_name],
-                        "text": loc[column_text],
-                        "likes": loc[column_likes],
-                        "comments": loc[column_comments] if column_comments in df.columns else "",
-                        "replies": "",
-                        "source": f
-                    })
-
-            top_posts = df\
-                .loc[:, column_name]\
-                .value_counts()
-
-            top_comments = df\
-                .groupby(column_name)[column_comments]\
-                .sum()\
-                .sort_values(ascending=False)\
-                if column_comments in df.columns else pd.Series()
-
-            top_liked = df\
-                .groupby(column_name)[column_likes]\
-                .sum()\
-                .sort_values(ascending=False)
-
-            top_replies_sent = replies\
-                [column_name]\
-                .value_counts()
-
-            top_replies_received = replies\
-                .iloc[:, 1]\
-                .apply(lambda x: x.split("-")[0])\
-                .apply(lambda x: thread_profiles[int(x)])\
-                .value_counts()
-
-            for k, v in top_posts.items():
-                profiles["posts"][k] += v
-            for k, v in top_comments.items():
-                profiles["comments"][k] += v
-            for k, v in top_liked.items():
-                profiles["likes"][k] += v
-            for k, v in top_replies_sent.items():
-                profiles["replies_sent"][k] += v
-            for k, v in top_replies_received.items():
-                profiles["replies_received"][k] += v
-
-            statistics[f]["replies_total"] = thread_ids.shape[0]
-            statistics[f]["replies_ancestors"] = thread_ids.apply(lambda x: x if "-" not in x else None).dropna().shape[0]
-            statistics[f]["replies_replies"] = thread_ids.apply(lambda x: x if "-" in x else None).dropna().shape[0]
-            statistics[f]["profiles"] = df.loc[:, column_name].unique().shape[0]
-
-            if len(top_posts):
-                statistics[f]["top_profile_in_posts"] = f"{top_posts.index[0]} ({top_posts.values[0]} comments)"
-
-            if len(top_comments):
-                statistics[f]["top_profile_in_comments"] = f"{top_posts.index[0]} ({top_posts.values[0]} comments)"
-
-            if len(top_liked):
-                statistics[f]["top_profile_in_likes"] = f"{top_liked.index[0]} ({top_liked.values[0]} likes)"
-
-            if len(top_replies_sent):
-                statistics[f]["top_profile_in_replies_sent"] = f"{top_replies_sent.index[0]} ({top_replies_sent.values[0]} replies)"
-
-            if len(top_replies_received):
-                statistics[f]["top_profile_in_replies_received"] = f"{top_replies_received.index[0]} ({top_replies_received.values[0]} replies)"
+        G_ngrams = G_ngrams.to_graph()
+        G_profiles = G_profiles.to_graph()
+        G_words = G_words.to_graph()
 
         if max_word_nodes:
             G_ngrams = nx.subgraph(G_ngrams, pd.Series(dict(G_ngrams.degree())).sort_values(ascending=False).index[:max_word_nodes])
@@ -373,7 +259,7 @@ class ParseComments():
                           output_format=output_format,
                           plot=True)
 
-        self.__write_file(pd.Series(hashtags),
+        self.__write_file(pd.Series(dict(hashtags.most_common()), dtype=int),
                           f"{output_name}/hashtags",
                           index_label="hashtag",
                           name="total",
@@ -389,7 +275,7 @@ class ParseComments():
                           output_format=output_format,
                           plot=True)
 
-        self.__write_file(pd.Series(ngrams),
+        self.__write_file(pd.Series(dict(ngrams.most_common()), dtype=int),
                           f"{output_name}/ngrams",
                           index_label="n-gram",
                           name="total",
@@ -441,7 +327,7 @@ class ParseComments():
                           output_format=output_format,
                           plot=True)
 
-        self.__write_file(pd.Series(words),
+        self.__write_file(pd.Series(dict(words.most_common()), dtype=int),
                           f"{output_name}/words",
                           index_label="word",
                           name="total",
@@ -452,7 +338,305 @@ class ParseComments():
 
         print(f"Total of {G_profiles.order()} profiles and {G_profiles.size()} connections.")
 
-    def _load_comments(self, name: str, skiprows: int = 0, nrows: int = None):
+    def _parse_file(
+        self,
+        f,
+        column_name=COLUMN_NAME,
+        column_comments=COLUMN_COMMENTS,
+        column_date=COLUMN_DATE,
+        column_likes=COLUMN_LIKES,
+        column_text=COLUMN_TEXT,
+        chunksize=CHUNKSIZE,
+        datetime_source=DATETIME_SOURCE,
+        datetime_target=DATETIME_TARGET,
+        n_grams=N_GRAMS,
+        n_replies=N_REPLIES,
+        n_threads=N_THREADS,
+        node_zero=NODE_ZERO,
+        remove_selfloops=REMOVE_SELFLOOPS,
+        quick_parse=QUICK_PARSE,
+        skiprows=0,
+        stop_words=STOPWORDS,
+    ) -> dict:
+        tokenizer = Tokenizer(stop_words=stop_words)
+        stop_words = stop_words = ["photo"]
+
+        threads = list()
+        dates = Counter()
+        hours = Counter()
+        profiles = defaultdict(Counter)
+        times = Counter()
+        statistics = dict()
+        hashtags = Counter()
+        ngrams = Counter()
+        words = Counter()
+
+        G_ngrams = CoOccurrence(remove_selfloops=remove_selfloops)
+        G_profiles = EdgeWeights(directed=True)
+        G_words = CoOccurrence(remove_selfloops=remove_selfloops)
+
+        chunks = self._load_comments(f, skiprows=skiprows, chunksize=chunksize)
+        chunks = [chunks] if chunksize is None else chunks
+
+        file_names = set()
+        has_comments = False
+        rows_posts = 0
+        rows_replies = 0
+        thread_profiles = {}
+        thread_replies = Counter()
+        post_ids = set()
+        reply_senders = []
+        reply_parents = []
+
+        for df in chunks:
+            print(f"Loaded {df.shape} objects from '{f}' (rows skipped: {skiprows}).")
+
+            for column in column_date:
+                if column in df.columns:
+                    column_date = column
+                    break
+
+            for column in column_name:
+                if column in df.columns:
+                    column_name = column
+                    break
+
+            for column in column_text:
+                if column in df.columns:
+                    column_text = column
+                    break
+
+            print(f"Processing rows...")
+            text = self.__get_text(df, column_text)
+
+            print(f"Processing hashtags...")
+            for k, v in text.apply(lambda x: self.__find_hashtags(x)).explode().value_counts().items():
+                hashtags[k] += v
+
+            print(f"Processing tokens...")
+            tokens = self.__get_tokens(text, tokenizer)
+
+            if not quick_parse:
+                print(f"Generating word graph...")
+                G_words.add_documents(tokens)
+
+            for k, v in tokens.explode().value_counts().items():
+                words[k] += v
+
+            print(f"Processing n-grams...")
+            tokens = self.__get_ngrams(tokens, tokenizer, n_grams)
+
+            if not quick_parse:
+                print(f"Generating n-gram graph...")
+                G_ngrams.add_documents(tokens)
+
+            for k, v in tokens.explode().value_counts().items():
+                ngrams[k] += v
+
+            print(f"Processing threads...")
+            try:
+                thread_profiles.update({
+                    int(k): y
+                    for k, x, y in zip(
+                        df.iloc[:, 0],
+                        df.iloc[:, 1],
+                        df.loc[:, column_name],
+                    )
+                    if type(x) != str
+                })
+            except:
+                column_name = column_name.split()[0]
+
+            datetimes = df\
+                .loc[:, column_date]\
+                .apply(lambda x: (datetime.strptime(x, datetime_source) if type(x) == str else x).strftime(datetime_target))
+
+            for k, v in datetimes.apply(lambda x: x[:10]).value_counts().items():
+                dates[k] += v
+            for k, v in datetimes.apply(lambda x: f"{x[:14]}00:00").value_counts().items():
+                hours[k] += v
+            for k, v in datetimes.apply(lambda x: f"{x[:18]}0").value_counts().items():
+                times[k] += v
+
+            posts, replies, reply_threads = self.__split_replies(df)
+
+            print(f"Generating profile graph...")
+
+            G_profiles.add_edges(
+                edges=[
+                    [s, node_zero]
+                    for s in
+                        posts.loc[:, column_name]
+                ],
+                remove_selfloops=remove_selfloops
+            )
+
+            # parents may come in later chunks
+            post_ids.update(posts.iloc[:, 0])
+            reply_senders.extend(replies.loc[:, column_name])
+            reply_parents.extend(reply_threads)
+
+            for k, v in df.loc[:, column_name].value_counts().items():
+                profiles["posts"][k] += v
+            if column_comments in df.columns:
+                for k, v in df.groupby(column_name)[column_comments].sum().items():
+                    profiles["comments"][k] += v
+            for k, v in df.groupby(column_name)[column_likes].sum().items():
+                profiles["likes"][k] += v
+            for k, v in replies.loc[:, column_name].value_counts().items():
+                profiles["replies_sent"][k] += v
+
+            file_names.update(df.loc[:, column_name].unique())
+            has_comments = has_comments or column_comments in df.columns
+            rows_posts += posts.shape[0]
+            rows_replies += replies.shape[0]
+
+        # map replies to profiles once all parents are known
+        reply_parents = pd.Series(reply_parents, dtype=float)
+        reply_profiles = reply_parents.map(thread_profiles)
+
+        G_profiles.add_edges(
+            edges=[
+                [s, t]
+                for s, t in zip(
+                    reply_senders,
+                    reply_profiles)
+                if pd.notna(t)
+                ],
+            remove_selfloops=remove_selfloops
+        )
+
+        for k, v in reply_profiles.value_counts().items():
+            profiles["replies_received"][k] += v
+
+        # threads whose post is missing are not listed
+        for k, v in reply_parents.loc[reply_parents.isin(post_ids)].value_counts().items():
+            thread_replies[k] += v
+        del reply_parents, post_ids
+
+        print(f"Generating statistics...")
+
+        top_threads = thread_replies.most_common(n_threads)
+        top_threads_posts = {}
+        top_threads_replies = None
+
+        # read again if chunked for top threads
+        if top_threads and chunksize is not None:
+            chunks = self._load_comments(f, skiprows=skiprows, chunksize=chunksize)
+
+        for df in (chunks if top_threads else []):
+            posts, replies, reply_threads = self.__split_replies(df)
+            ids = [k for k, v in top_threads]
+
+            for k, loc in posts.loc[posts.iloc[:, 0].isin(ids)].iterrows():
+                top_threads_posts.setdefault(loc.iloc[0], loc)
+
+            # keep top replies of each thread so far
+            is_top = reply_threads.isin(ids)
+            top_replies = replies.loc[is_top].assign(_thread=reply_threads.loc[is_top])
+
+            top_threads_replies = pd\
+                .concat([top_threads_replies, top_replies] if top_threads_replies is not None else [top_replies])\
+                .sort_values(column_likes, ascending=False, kind="stable")\
+                .groupby("_thread", sort=False)\
+                .head(n_replies)
+
+        top_threads_replies = dict(list(top_threads_replies.groupby("_thread", sort=False)))\
+            if top_threads_replies is not None else {}
+
+        for i, thread in enumerate(top_threads):
+            loc = top_threads_posts[thread[0]]
+            threads.append({
+                "#": f"{i+1}",
+                "profile": loc[column_name],
+                "text": loc[column_text],
+                "likes": loc[column_likes],
+                "comments": loc[column_comments] if has_comments else "",
+                "replies": thread[1],
+                "source": f
+            })
+
+            for j, (reply, loc) in enumerate(top_threads_replies.get(thread[0], pd.DataFrame()).iterrows()):
+                threads.append({
+                    "#": f"{i+1}-{j+1}",
+                    "profile": loc[column_name],
+                    "text": loc[column_text],
+                    "likes": loc[column_likes],
+                    "comments": loc[column_comments] if has_comments else "",
+                    "replies": "",
+                    "source": f
+                })
+
+        statistics["replies_total"] = rows_posts + rows_replies
+        statistics["replies_ancestors"] = rows_posts
+        statistics["replies_replies"] = rows_replies
+        statistics["profiles"] = len(file_names)
+
+        for key, unit in [
+            ("posts", "comments"),
+            ("comments", "comments"),
+            ("likes", "likes"),
+            ("replies_sent", "replies"),
+            ("replies_received", "replies"),
+        ]:
+            if profiles[key]:
+                k, v = profiles[key].most_common(1)[0]
+                statistics[f"top_profile_in_{key}"] = f"{k} ({v} {unit})"
+
+        return {
+            "dates": dates,
+            "hashtags": hashtags,
+            "hours": hours,
+            "ngrams": ngrams,
+            "profiles": profiles,
+            "statistics": statistics,
+            "threads": threads,
+            "times": times,
+            "words": words,
+            "G_ngrams": G_ngrams,
+            "G_profiles": G_profiles,
+            "G_words": G_words,
+        }
+
+    def _count_pairs(
+        self,
+        f,
+        vocabulary_ngrams,
+        vocabulary_words,
+        column_text=COLUMN_TEXT,
+        chunksize=CHUNKSIZE,
+        n_grams=N_GRAMS,
+        remove_selfloops=REMOVE_SELFLOOPS,
+        skiprows=0,
+        stop_words=STOPWORDS,
+    ) -> dict:
+        tokenizer = Tokenizer(stop_words=stop_words)
+
+        G_ngrams = CoOccurrence(vocabulary_ngrams, remove_selfloops)
+        G_words = CoOccurrence(vocabulary_words, remove_selfloops)
+
+        chunks = self._load_comments(f, skiprows=skiprows, chunksize=chunksize)
+        chunks = [chunks] if chunksize is None else chunks
+
+        for df in chunks:
+            for column in column_text:
+                if column in df.columns:
+                    column_text = column
+                    break
+
+            print(f"Generating word and n-gram graphs from '{f}'...")
+            tokens = self.__get_tokens(self.__get_text(df, column_text), tokenizer)
+            G_words.add_documents(tokens)
+            G_ngrams.add_documents(self.__get_ngrams(tokens, tokenizer, n_grams))
+
+        return {
+            "G_ngrams": G_ngrams,
+            "G_words": G_words,
+        }
+
+    def _load_comments(self, name: str, skiprows: int = 0, nrows: int = None, chunksize: int = None):
+        if chunksize and splitext(name)[1] in (".xls", ".xlsx"):
+            return iter([self._load_comments(name, skiprows=skiprows, nrows=nrows)])
         return (
             pd.read_excel(
                 name,
@@ -464,51 +648,62 @@ class ParseComments():
                 name,
                 delimiter=self.__get_delimiter(name),
                 nrows=nrows,
-                skiprows=skiprows
+                skiprows=skiprows,
+                chunksize=chunksize
             )
         )
 
-    @staticmethod
-    def __add_edges_to_graph(
-        G: nx.Graph,
-        edges: list,
-        remove_selfloops: bool = False,
-        weights: Union[bool, dict, pd.Series] = True,
-    ) -> nx.Graph:
-
-        if type(weights) == bool and weights is True:
-            weights = pd.Series(edges).astype(str).value_counts()
-
-        if type(weights) in (dict, pd.Series):
-            weights = pd\
-                .Series(weights)\
-                .add(
-                    pd.Series({f"{[x[0], x[1]]}": x[2]["weight"] for x in G.edges(data=True)}, dtype=float),
-                    fill_value=0
-                )\
-                .astype(float)
-
-            G.add_weighted_edges_from([
-                [e[0], e[1], weights[str(e)]]
-                for e in edges
-                if (e[0] != e[1] or (e[0] == e[1] and not remove_selfloops))
-            ])
-
-            return G
-
-        G.add_edges_from([
-            [e[0], e[1]]
-            for e in edges
-            if e[0] != e[1]
-            or (e[0] == e[1] and not remove_selfloops)
-        ])
-        return G
-
     @staticmethod
     def __find_hashtags(x) -> list:
         hashtags = re.findall(r"#[a-zA-Z0-9_]{0,30}", x.lower()) if isinstance(x, str) else []
         return [hashtag for hashtag in hashtags if len(hashtag)>1 ]
 
+    @staticmethod
+    def __get_text(df: pd.DataFrame, column_text: str) -> pd.Series:
+        return df\
+            .loc[:, column_text]\
+            .apply(str)\
+            .apply(lambda x: x.split("\n"))\
+            .apply(lambda x: x if x else None)\
+            .dropna()\
+            .explode()
+
+    @staticmethod
+    def __get_tokens(text: pd.Series, tokenizer) -> pd.Series:
+        return text\
+            .apply(lambda x: tokenizer.tokenize(x) or None)\
+            .dropna()
+
+    @staticmethod
+    def __get_ngrams(tokens: pd.Series, tokenizer, n_grams: int) -> pd.Series:
+        return tokens\
+            .apply(lambda x: tokenizer.ngrams(x, n=n_grams) or None)\
+            .dropna()\
+            .apply(lambda x: [" ".join(_) for _ in x])
+
+    @staticmethod
+    def __split_replies(df: pd.DataFrame) -> tuple:
+        is_reply = pd.Series([
+            "-" in str(y if type(y) == str else x)
+            for x, y in zip(
+                df.iloc[:, 0],
+                df.iloc[:, 1],
+            )
+        ], index=df.index, dtype=bool)
+
+        posts = df.loc[~is_reply]
+        replies = df.loc[is_reply]
+
+        # parent ID of each reply
+        reply_threads = replies\
+            .iloc[:, 1]\
+            .astype(str)\
+            .str.split("-", n=1)\
+            .str[0]\
+            .astype(float)
+
+        return posts, replies, reply_threads
+
     @staticmethod
     def __get_delimiter(input_name: str) -> str:
         with open(input_name, 'rt') as f:
@@ -553,7 +748,23 @@ class ParseComments():
         if name:
             df.name = name
 
-        if write is True:
+        if write is True and output_format in COLUMNAR_FORMATS:
+            table = df.to_frame() if isinstance(df, pd.Series) else df.copy()
+            if index is True:
+                table = table.rename_axis(index_label or "index").reset_index()
+            table.columns = table.columns.astype(str)
+            # numbers if possible, else strings (see lib_output.write_table)
+            for column in table.select_dtypes(include=["object", "string"]).columns:
+                try:
+                    table[column] = pd.to_numeric(table[column])
+                except (TypeError, ValueError):
+                    table[column] = table[column].map(lambda x: x if isinstance(x, str) or pd.isna(x) else str(x))
+            if output_format == "parquet":
+                table.to_parquet(f"{output_name}.parquet", index=False)
+            else:
+                table.to_feather(f"{output_name}.arrow")
+
+        elif write is True:
             getattr(df, f"to_{output_format}")(
                 "%s.%s" % (output_name, "xlsx" if output_format == "excel" else "csv"),
                 header=header,
@@ -603,17 +814,7 @@ class Tokenizer():
 
     @staticmethod
     def clear_emojis(str_text, replace_with=r' '):
-        return re\
-            .compile("["
-                u"\U0001F600-\U0001F64F"  # emoticons
-                u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-                u"\U0001F680-\U0001F6FF"  # transport & map symbols
-                u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-                u"\U00002702-\U000027B0"  # extra (1)
-                u"\U000024C2-\U0001F251"  # extra (2)
-                u"\U0000200B-\U0000200D"  # zero width
-                "]+", flags=re.UNICODE)\
-            .sub(replace_with, str_text)
+        return EMOJI_REGEX.sub(replace_with, str_text)
 
     @staticmethod
     def ngrams(tokens: list, n=2):
@@ -624,6 +825,143 @@ class Tokenizer():
         ]
 
 
+class EdgeWeights():
+    """
+    Count edge weights by pairs of integer node IDs,
+    across files, and build the graph only once.
+    """
+
+    def __init__(self, directed: bool = False):
+        self.directed = directed
+        self.ids = {}
+        self.nodes = []
+        self.weights = Counter()
+
+    def add_edges(self, edges, remove_selfloops: bool = False) -> None:
+        weights = self.weights
+
+        for e in edges:
+            s, t = self.get_ids(e[:2])
+            if s == t and remove_selfloops:
+                continue
+            weights[(s, t) if self.directed or s <= t else (t, s)] += 1
+
+    def get_ids(self, nodes) -> list:
+        ids = []
+
+        for node in nodes:
+            i = self.ids.get(node)
+            if i is None:
+                i = self.ids[node] = len(self.nodes)
+                self.nodes.append(node)
+            ids.append(i)
+
+        return ids
+
+    def merge(self, other) -> None:
+        ids = self.get_ids(other.nodes)
+
+        for (s, t), w in other.weights.items():
+            s, t = ids[s], ids[t]
+            self.weights[(s, t) if self.directed or s <= t else (t, s)] += w
+
+    def to_graph(self) -> nx.Graph:
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        G.add_weighted_edges_from(
+            (self.nodes[s], self.nodes[t], float(w))
+            for (s, t), w in self.weights.items()
+        )
+        return G
+
+
+class CoOccurrence(EdgeWeights):
+    """
+    Count pairs of tokens in the same document from
+    sparse document-term matrices (X), as X'X, optionally
+    for the tokens of a given vocabulary only. Counts each
+    pair of tokens by combinations if SciPy is not available.
+    """
+
+    def __init__(self, vocabulary: list = None, remove_selfloops: bool = False):
+        super().__init__()
+        self.remove_selfloops = remove_selfloops
+        self.counts = None
+        self.vocabulary = vocabulary is not None
+
+        if vocabulary is not None:
+            self.get_ids(vocabulary)
+
+    def add_documents(self, documents) -> None:
+        if self.vocabulary:
+            ids = self.ids
+            documents = ([x for x in _ if x in ids] for _ in documents)
+
+        if sparse is None:
+            return self.add_edges(
+                (e for _ in documents for e in combinations(_, 2)),
+                remove_selfloops=self.remove_selfloops,
+            )
+
+        indices = []
+        indptr = [0]
+
+        for document in documents:
+            indices.extend(self.get_ids(document))
+            indptr.append(len(indices))
+
+        X = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), indices, indptr),
+            shape=(len(indptr) - 1, len(self.nodes)),
+        )
+        X.sum_duplicates()
+
+        self.add_counts(self.count_pairs(X))
+
+    def add_counts(self, C) -> None:
+        if self.counts is None:
+            self.counts = C
+        else:
+            self.counts.resize(C.shape)
+            self.counts = self.counts + C
+
+    def count_pairs(self, X):
+        # distinct tokens pair up count(a) * count(b) times
+        # per document, and the same token C(count(a), 2) times
+        C = (X.T @ X).tocsr()
+        diagonal = C.diagonal()
+        pairs = 0 if self.remove_selfloops else (diagonal - np.asarray(X.sum(axis=0)).ravel()) // 2
+        C = (C - sparse.diags(diagonal - pairs)).tocsr()
+        C.eliminate_zeros()
+        return C
+
+    def merge(self, other) -> None:
+        if sparse is None:
+            return super().merge(other)
+
+        ids = np.array(self.get_ids(other.nodes), dtype=np.int64)
+        n = len(self.nodes)
+
+        if other.counts is not None:
+            C = other.counts.tocoo()
+            self.add_counts(sparse.csr_matrix((C.data, (ids[C.row], ids[C.col])), shape=(n, n)))
+
+    def to_graph(self) -> nx.Graph:
+        if sparse is None:
+            return super().to_graph()
+
+        nodes = self.nodes
+        C = self.counts
+
+        G = nx.Graph()
+        if C is not None:
+            C = sparse.triu(C).tocoo()
+            G.add_weighted_edges_from(
+                (nodes[s], nodes[t], float(w))
+                for s, t, w in zip(C.row, C.col, C.data)
+            )
+        return G
+
+
 def argsparse() -> dict:
     '''
     Returns dictionary of parameters for execution.
@@ -643,6 +981,15 @@ def argsparse() -> dict:
                            dest="remove_selfloops",
                            help="Allow node connections to itself in graphs")
 
+    argparser.add_argument("--cap-vocabulary",
+                           action="store_true",
+                           help="Count word and n-gram pairs only for the most frequent --max-word-nodes")
+
+    argparser.add_argument("--chunksize",
+                           default=CHUNKSIZE,
+                           help="Number of rows to read at a time from CSV files (default: whole file)",
+                           type=int)
+
     argparser.add_argument("--datetime-source",
                            default=DATETIME_SOURCE,
                            help=f"Datetime format to convert string from (default: 'DD/MM/YYYY HH:MM:SS')")
@@ -673,6 +1020,11 @@ def argsparse() -> dict:
                            help=f"Number of grams to consider (default: {N_GRAMS})",
                            type=int)
 
+    argparser.add_argument("--n-jobs",
+                           default=N_JOBS,
+                           help=f"Number of processes to parse files with (default: {N_JOBS})",
+                           type=int)
+
     argparser.add_argument("--n-replies",
                            default=N_REPLIES,
                            help=f"Number of top replies per threads to consider (default: {N_REPLIES})",
@@ -689,7 +1041,7 @@ def argsparse() -> dict:
 
     argparser.add_argument("--output-format",
                            default=OUTPUT_FORMAT,
-                           help="Output format: 'csv' (default) or 'excel'")
+                           help="Output format: 'csv' (default), 'excel', 'parquet' or 'arrow'")
 
     argparser.add_argument("--skiprows",
                            default=SKIPROWS,
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# parse_comments can also run as a script, without the package
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "fordpip"))
+parse_comments = pytest.importorskip("parse_comments")
+
+COMMENTS = """ID,Reply to,Name,Date,Likes,Comment
+1,,user1,2023-01-01 10:00:00,5,amor vida feliz
+,1-1,user2,2023-01-01 11:00:00,3,amor casa
+,13-1,user3,2023-01-02 10:00:00,8,gato noite
+,13-2,user4,2023-01-02 11:00:00,1,gato dia
+,13-3,user5,2023-01-02 12:00:00,2,gato mar
+2,,user6,2023-01-03 10:00:00,1,vida mar
+"""
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+def test_threads_skip_missing_parent(tmp_path, chunksize):
+    name = tmp_path / "comments.csv"
+    name.write_text(COMMENTS, encoding="utf8")
+
+    result = parse_comments.ParseComments()._parse_file(str(name), chunksize=chunksize)
+
+    threads = [x for x in result["threads"] if "-" not in x["#"]]
+    assert [(x["profile"], x["replies"]) for x in threads] == [("user1", 1)]
+    assert result["statistics"]["replies_replies"] == 4